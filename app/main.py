@@ -11,11 +11,26 @@ Responsibilities:
 
 Business logic lives in:
   app/services/email.py      → AI generation + email delivery
+  app/services/email_queue.py → Durable SQLite email job queue + worker pool
+  app/services/resend_batcher.py → Micro-batched Resend delivery (Batch.send)
+  app/services/smtp_pool.py  → Reusable logged-in Gmail SMTP sessions
   app/services/outreach.py   → GitHub follow + LinkedIn connect
+  app/services/http_client.py → Shared keep-alive HTTP session for outbound calls
   app/services/portfolio.py  → Portfolio data + prompt builders
   app/services/sheets.py     → Google Sheets backup
+  app/services/sheets_writer.py → Durable outbox + batched drainer for Sheets writes
+  app/services/sheets_mirror.py → Delta-synced local copy of the sheet
   app/settings/config.py     → All environment variables
+  app/utils/visitor_store.py → Picks the visitor log backend (Excel / SQLite)
   app/utils/excel_manager.py → Primary Excel visitor log
+  app/utils/file_lock.py     → Cross-process flock for shared log files
+  app/utils/sqlite_store.py  → SQLite visitor log backend
+  app/utils/visitor_journal.py → Append-only journal behind the Excel log
+  app/utils/visitor_writer.py → Group-commit writer for visitor rows
+  app/utils/record_cache.py  → TTL cache of merged admin records
+  app/utils/search_index.py  → Full-text index behind /admin/visitors?q=
+  app/utils/visitor_analytics.py → NumPy histograms behind /admin/analytics
+  app/utils/event_bus.py     → In-process pub/sub behind /admin/stream
   app/utils/rate_limiter.py  → In-memory sliding window rate limiter
   app/router/log_router.py   → Visitor logging routes
   app/router/admin_router.py → Admin panel routes
@@ -32,7 +47,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 
-from app.services.sheets import init_sheets
+from app.services.email import email_queue, resend_batcher, smtp_pool
+from app.services.http_client import close_http
+from app.services.sheets import close_sheets, init_sheets, sheets_writer
 from app.settings.config import get_settings
 from app.utils.rate_limiter import RateLimiter
 from app.router.portfolio_router import router as portfolio_router
@@ -76,9 +93,22 @@ def get_client_ip(request: Request) -> str:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Portfolio API starting up.")
-    init_sheets()
+    init_sheets()                 # connects in the background — doesn't delay startup
+    visitor_writer.start()
+    sheets_writer.start()
+    resend_batcher.start()
+    email_queue.start()           # resumes jobs left by a previous process
     yield
     logger.info("Portfolio API shutting down.")
+    visitor_writer.stop()
+    sheets_writer.stop()
+    email_queue.stop()            # before the batcher/pool it sends through
+    resend_batcher.stop()
+    close_sheets()
+    close_http()
+    smtp_pool.close()
+    visitor_store.close()
+    admin_cache.close()
 
 
 # ── App ────────────────────────────────────────────────────────────────────
@@ -126,7 +156,9 @@ async def rate_limit(request: Request, call_next):
 
 # ── Routers ────────────────────────────────────────────────────────────────
 from app.chatbot.router import router as chatbot_router
+from app.router.admin_router import admin_cache
 from app.router.admin_router import router as admin_router
+from app.router.log_router import visitor_store, visitor_writer
 from app.router.log_router import router as log_router
 
 app.include_router(chatbot_router)
@@ -6,38 +6,86 @@ Rate limiting:
   /login → strict (5 per 5 min) — brute force protection
   All other endpoints → protected by JWT, no extra rate limit needed
 
+Live updates:
+  /stream → Server-Sent Events from the in-process event bus; accepts the
+            JWT as a Bearer header or ?token= (EventSource can't send headers)
+
 Data source:
-  Primary  → Excel (/backend/logs/visitors.xlsx)
+  Primary  → visitor store (Excel or SQLite, see VISITOR_STORE)
   Backup   → Google Sheets
-  Strategy → merge both, deduplicate by ID, newest first
+  Strategy → merge both, deduplicate by ID, newest first —
+             cached for ADMIN_CACHE_TTL seconds, merged incrementally.
+             Both are fetched concurrently; Sheets gets SHEETS_READ_TIMEOUT
+             seconds, after which responses carry "partial": true
+  Search   → /visitors?q= is answered from an in-process inverted index
+             (app/utils/search_index.py) fed by store writes and cache merges
+
+Email queue:
+  /email-queue → job counts, backlog age and recent dead letters of the
+                 durable email queue (app/services/email_queue.py)
 """
 
+import asyncio
+import base64
+import csv
 import io
+import json
 import logging
+import tempfile
 from datetime import datetime, timedelta, timezone
+from itertools import chain, islice
+from typing import Iterable
 
 import bcrypt
 import jwt
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Color, Font, PatternFill
 from pydantic import BaseModel
 
+from app.services.email import email_queue
 from app.services.sheets import get_all_from_sheets
 from app.settings.config import get_settings
-from app.utils.excel_manager import ExcelManager
 from app.utils.rate_limiter import RateLimiter
+from app.utils.event_bus import get_event_bus
+from app.utils.excel_manager import in_date_range
+from app.utils.record_cache import MergedRecordCache
+from app.utils.search_index import SearchIndex
+from app.utils.visitor_analytics import NUMPY_OK, VisitorAnalytics
+from app.utils.visitor_store import get_visitor_store
 
 logger   = logging.getLogger("portfolio.admin")
 settings = get_settings()
 router   = APIRouter(prefix="/admin", tags=["admin"])
 
-_excel         = ExcelManager("/backend/logs/visitors.xlsx")
+_store         = get_visitor_store()
+_search        = SearchIndex()
+_analytics     = VisitorAnalytics()
+_event_bus     = get_event_bus()
+
+
+def _index_records(records: list[dict]):
+    """Keep the search index and analytics snapshot current — both upsert by ID."""
+    _search.add(records)
+    _analytics.add(records)
+
+
+admin_cache    = MergedRecordCache(
+    lambda since: _store.get_all_visitors(since=since or None),   # since-cursor: only new/updated rows
+    get_all_from_sheets,
+    ttl=settings.admin_cache_ttl,
+    on_change=_index_records,
+    sheets_timeout=settings.sheets_read_timeout,
+)
+_store.add_listener(_index_records)
 _login_limiter = RateLimiter.for_login()   # only login needs rate limiting
 
 JWT_ALGORITHM    = "HS256"
 JWT_EXPIRE_HOURS = 8
+STREAM_KEEPALIVE = 15   # seconds between SSE comments on an idle stream
 security         = HTTPBearer(auto_error=False)
 
 
@@ -51,14 +99,10 @@ def create_token(username: str) -> str:
     return jwt.encode(payload, settings.jwt_secret, algorithm=JWT_ALGORITHM)
 
 
-def verify_token(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> str:
-    if not credentials:
-        raise HTTPException(status_code=401, detail="Not authenticated")
+def _decode_token(token: str) -> str:
     try:
         payload = jwt.decode(
-            credentials.credentials,
+            token,
             settings.jwt_secret,
             algorithms=[JWT_ALGORITHM],
         )
@@ -69,6 +113,26 @@ def verify_token(
         raise HTTPException(status_code=401, detail="Invalid token")
 
 
+def verify_token(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> str:
+    if not credentials:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return _decode_token(credentials.credentials)
+
+
+def verify_stream_token(
+    token: str = "",
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> str:
+    """Bearer header, or ?token= — the browser EventSource can't set headers."""
+    if credentials:
+        return _decode_token(credentials.credentials)
+    if token:
+        return _decode_token(token)
+    raise HTTPException(status_code=401, detail="Not authenticated")
+
+
 # ── IP helper ──────────────────────────────────────────────────────────────
 def _get_ip(request: Request) -> str:
     forwarded = request.headers.get("X-Forwarded-For", "")
@@ -78,29 +142,13 @@ def _get_ip(request: Request) -> str:
 
 
 # ── Merge helper ───────────────────────────────────────────────────────────
-def _get_merged_records() -> list[dict]:
+def _get_merged_records(since: str = "", until: str = "") -> list[dict]:
     """
-    Merge Excel + Sheets, deduplicate by ID, Excel takes priority.
+    Visitor store + Sheets, deduplicated by ID (the store takes priority),
+    newest first. Served from the TTL cache — see app/utils/record_cache.py.
     Skipped visitors included — they have userType=skipped.
     """
-    excel_records  = _excel.get_all_visitors()
-    sheets_records = get_all_from_sheets()
-
-    merged: dict[str, dict] = {}
-
-    for record in excel_records:
-        record_id = record.get("ID")
-        if record_id:
-            merged[record_id] = record
-
-    for record in sheets_records:
-        record_id = record.get("ID")
-        if record_id and record_id not in merged:
-            merged[record_id] = record
-
-    records = list(merged.values())
-    records.sort(key=lambda r: str(r.get("Timestamp", "")), reverse=True)
-    return records
+    return admin_cache.get(since, until)
 
 
 # ── Models ─────────────────────────────────────────────────────────────────
@@ -154,46 +202,166 @@ def admin_login(
 # ── Stats ──────────────────────────────────────────────────────────────────
 @router.get("/stats")
 def admin_stats(username: str = Depends(verify_token)):
-    records = _get_merged_records()
-    today   = datetime.now().strftime("%Y-%m-%d")
-    return {
-        "total":     len(records),
-        "hr":        sum(1 for r in records if r.get("UserType") == "hr"),
-        "developer": sum(1 for r in records if r.get("UserType") == "developer"),
-        "visitor":   sum(1 for r in records if r.get("UserType") == "visitor"),
-        "skipped":   sum(1 for r in records if r.get("UserType") == "skipped"),
-        "today":     sum(1 for r in records if str(r.get("Timestamp", "")).startswith(today)),
-    }
+    # Counters are maintained by the store on every append — O(1), no merge
+    return _store.get_stats()
+
+
+# ── Live stream ────────────────────────────────────────────────────────────
+@router.get("/stream")
+async def admin_stream(
+    request: Request,
+    username: str = Depends(verify_stream_token),
+):
+    """
+    Server-Sent Events feed — `visitor`, `stats` (counter deltas) and
+    `contact` events as the visitor store commits them. Idle streams get
+    a keep-alive comment every STREAM_KEEPALIVE seconds.
+
+    Known gap: the event bus is per process. With several uvicorn workers
+    a stream only carries the writes of the worker serving it, so it is a
+    hint to refresh sooner, not a replacement for polling /visitors and
+    /stats — flagged to clients by `X-Stream-Scope: worker`.
+    """
+    queue = _event_bus.subscribe()
+
+    async def events():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        finally:
+            _event_bus.unsubscribe(queue)
+
+    logger.info(f"Admin stream opened by {username}")
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Stream-Scope": "worker"},
+    )
+
+
+# ── Analytics ──────────────────────────────────────────────────────────────
+@router.get("/analytics")
+def admin_analytics(
+    since: str = "",
+    until: str = "",
+    username: str = Depends(verify_token),
+):
+    """
+    Per-day, per-week and hour-of-day visitor counts, each broken down by
+    UserType, Source and Status, plus skip rate and HR conversion
+    (hr / non-skipped visitors). Buckets span since → until (default: first
+    visit → today); timestamps outside are counted in out_of_range.
+    Vectorised over a columnar NumPy snapshot of the merged records — see
+    app/utils/visitor_analytics.py.
+    """
+    if not NUMPY_OK:
+        raise HTTPException(status_code=503, detail="Analytics unavailable (numpy not installed)")
+    admin_cache.refresh()   # fold in Sheets rows and other workers' writes
+    try:
+        return {**_analytics.compute(since, until), "partial": admin_cache.partial}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="since/until must be YYYY-MM-DD[ HH:MM:SS]")
 
 
 # ── Visitor list ───────────────────────────────────────────────────────────
+def _encode_cursor(position: tuple[str, str]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(position)).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        timestamp, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(timestamp), str(record_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _visitor_filter(user_type: str, company: str, status: str):
+    """Predicate pushed down into the cache scan — None when nothing to filter."""
+    if not (user_type or company or status):
+        return None
+    company = company.lower()
+    status  = status.lower()
+
+    def match(r: dict) -> bool:
+        if user_type and r.get("UserType") != user_type:
+            return False
+        if company and company not in str(r.get("Company") or "").lower():
+            return False
+        if status and str(r.get("Status") or "").lower() != status:
+            return False
+        return True
+
+    return match
+
+
 @router.get("/visitors")
 def admin_visitors(
     page: int = 1,
     per_page: int = 50,
     user_type: str = "",
+    since: str = "",
+    until: str = "",
+    company: str = "",
+    status: str = "",
+    cursor: str = "",
+    q: str = "",
     username: str = Depends(verify_token),
 ):
-    records = _get_merged_records()
-
-    if user_type:
-        records = [r for r in records if r.get("UserType") == user_type]
-
-    total     = len(records)
-    start     = (page - 1) * per_page
-    paginated = records[start : start + per_page]
-
-    for r in paginated:
-        if r.get("Body") and len(str(r["Body"])) > 120:
-            r["Body"] = str(r["Body"])[:120] + "…"
-
-    return {
-        "total":    total,
-        "page":     page,
-        "per_page": per_page,
-        "pages":    (total + per_page - 1) // per_page,
-        "data":     paginated,
+    """
+    Keyset pagination — pass back `next_cursor` as ?cursor= for the next page;
+    every page then costs the same as page 1. Without a cursor the legacy
+    page/per_page offset mode is used, and total/pages are included.
+    Filters (user_type, company, status, since/until) are applied inside the
+    cache scan, so only the requested page is materialised.
+    q → full-text search, ranked by relevance; paged with page/per_page.
+    """
+    per_page = max(1, min(per_page, 500))
+    match    = _visitor_filter(user_type, company, status)
+
+    if q:
+        admin_cache.refresh()   # make sure the index has seen the first merge
+        hits = [
+            r for r in _search.search(q)
+            if in_date_range(r, since, until) and (match is None or match(r))
+        ]
+        rows = islice(hits, (max(page, 1) - 1) * per_page, None)
+    elif cursor:
+        rows = admin_cache.scan(_decode_cursor(cursor), since, until, match)
+    else:
+        rows = islice(admin_cache.scan(None, since, until, match), (max(page, 1) - 1) * per_page, None)
+    paginated = list(islice(rows, per_page + 1))
+
+    has_more  = len(paginated) > per_page
+    paginated = paginated[:per_page]
+
+    # Records are shared with the visitor log snapshot — truncate on copies
+    data = [
+        {**r, "Body": str(r["Body"])[:120] + "…"}
+        if r.get("Body") and len(str(r["Body"])) > 120
+        else r
+        for r in paginated
+    ]
+    response = {
+        "per_page":    per_page,
+        "next_cursor": _encode_cursor(admin_cache.position(paginated[-1])) if has_more and not q else None,
+        "partial":     admin_cache.partial,   # Sheets missed its deadline — store data only
+        "data":        data,
     }
+    if not cursor:
+        total = len(hits) if q else admin_cache.count(since, until, match)
+        response.update({
+            "total": total,
+            "page":  page,
+            "pages": (total + per_page - 1) // per_page,
+        })
+    return response
 
 
 # ── Single visitor ─────────────────────────────────────────────────────────
@@ -202,48 +370,117 @@ def admin_visitor_detail(
     visitor_id: str,
     username: str = Depends(verify_token),
 ):
-    records = _get_merged_records()
-    record  = next((r for r in records if r.get("ID") == visitor_id), None)
+    # Indexed lookup in the store; Sheets-only rows come from the merge cache
+    record = _store.get_visitor(visitor_id) or admin_cache.get_by_id(visitor_id)
     if not record:
         raise HTTPException(status_code=404, detail="Visitor not found")
     return record
 
 
-# ── Export ─────────────────────────────────────────────────────────────────
-@router.get("/export")
-def admin_export(username: str = Depends(verify_token)):
-    records = _get_merged_records()
+# ── Email queue ────────────────────────────────────────────────────────────
+@router.get("/email-queue")
+def admin_email_queue(
+    dead_limit: int = Query(20, ge=0, le=200),
+    username: str = Depends(verify_token),
+):
+    """Queued / running / done / dead job counts and the latest dead-lettered jobs."""
+    try:
+        return email_queue.status(dead_limit)
+    except Exception as e:
+        logger.error(f"Email queue status failed: {e}")
+        raise HTTPException(status_code=503, detail="Email queue unavailable")
 
-    if not records:
-        raise HTTPException(status_code=404, detail="No visitor data found")
 
-    wb = Workbook()
-    ws = wb.active
-    assert ws is not None
-    ws.title = "Visitors"
+# ── Export ─────────────────────────────────────────────────────────────────
+_EXPORT_CHUNK = 64 * 1024
+_EXPORT_TYPES = {
+    "xlsx":   "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv":    "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
 
-    headers = list(records[0].keys())
-    fill    = PatternFill(fill_type="solid", fgColor=Color(rgb="FF1F2D3D"))
-    font    = Font(bold=True, color="FFFFFF", name="Calibri")
 
-    for col, header in enumerate(headers, start=1):
-        ws.cell(row=1, column=col, value=header)
-        cell           = ws.cell(row=1, column=col)
+def _export_xlsx(records: Iterable[dict], headers: list[str]):
+    """
+    Buffered, not streamed: an xlsx is a zip whose directory is written
+    last, so nothing can be sent until the workbook is complete. Write-only
+    mode keeps memory flat (rows go to a temp file as they are appended,
+    never held as cells); the finished file is then sent in chunks.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Visitors")
+
+    fill = PatternFill(fill_type="solid", fgColor=Color(rgb="FF1F2D3D"))
+    font = Font(bold=True, color="FFFFFF", name="Calibri")
+    header_cells = []
+    for header in headers:
+        cell           = WriteOnlyCell(ws, value=header)
         cell.fill      = fill
         cell.font      = font
         cell.alignment = Alignment(horizontal="center")
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    for record in records:
+        ws.append([record.get(key, "") for key in headers])
+
+    with tempfile.TemporaryFile() as tmp:
+        wb.save(tmp)
+        tmp.seek(0)
+        while chunk := tmp.read(_EXPORT_CHUNK):
+            yield chunk
+
+
+def _export_csv(records: Iterable[dict], headers: list[str]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    for record in records:
+        writer.writerow([record.get(key, "") for key in headers])
+        if buffer.tell() >= _EXPORT_CHUNK:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def _export_ndjson(records: Iterable[dict], headers: list[str]):
+    for record in records:
+        yield (json.dumps({key: record.get(key, "") for key in headers}, default=str) + "\n").encode("utf-8")
+
 
-    for row_idx, record in enumerate(records, start=2):
-        for col, key in enumerate(headers, start=1):
-            ws.cell(row=row_idx, column=col, value=record.get(key, ""))
+_EXPORTERS = {"xlsx": _export_xlsx, "csv": _export_csv, "ndjson": _export_ndjson}
 
-    buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
 
-    filename = f"visitors_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    return Response(
-        content=buffer.read(),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-    )
\ No newline at end of file
+@router.get("/export")
+def admin_export(
+    since: str = "",
+    until: str = "",
+    fmt: str = Query("xlsx", alias="format"),
+    username: str = Depends(verify_token),
+):
+    """
+    Export merged records, newest first, as xlsx (default), csv or ndjson.
+    csv and ndjson are streamed row by row off a lazy cache scan; xlsx is
+    built in a temp file first and sent once complete.
+    """
+    if fmt not in _EXPORTERS:
+        raise HTTPException(status_code=400, detail="format must be one of: xlsx, csv, ndjson")
+
+    scan  = admin_cache.scan(since=since, until=until)
+    first = next(scan, None)
+
+    if first is None:
+        raise HTTPException(status_code=404, detail="No visitor data found")
+
+    headers  = list(first.keys())
+    records  = chain([first], scan)
+    filename = f"visitors_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+    return StreamingResponse(
+        _EXPORTERS[fmt](records, headers),
+        media_type=_EXPORT_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Partial-Data":      "true" if admin_cache.partial else "false",
+        },
+    )
@@ -6,6 +6,12 @@ Rate limiting:
   /log-visitor  → email limiter (hr only)  — triggers AI + email pipeline
   /log-skip     → general limiter          — simple write, no AI
   /contact-outreach → general limiter      — GitHub/LinkedIn calls, no AI
+
+Live updates:
+  Every logged row, stats delta and contact update is published on the
+  in-process event bus for /admin/stream. All three are published by
+  store listeners once the write lands, so the stream never shows a row
+  or a contact update that was not written.
 """
 
 import logging
@@ -15,19 +21,22 @@ from uuid import uuid4
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 
 from app.models.log_model import ContactInfo, User
-from app.services.email import generate_email_from_prompt, send_email_background
+from app.services.email import queue_email, queue_visitor_email
 from app.services.outreach import connect_on_linkedin, follow_on_github
-from app.services.portfolio import build_future_opportunity_prompt, build_role_aware_prompt
 from app.services.sheets import sheet_append, sheet_update_contact
 from app.settings.config import get_settings
-from app.utils.excel_manager import ExcelManager
+from app.utils.event_bus import get_event_bus
 from app.utils.rate_limiter import RateLimiter
+from app.utils.visitor_store import get_visitor_store
+from app.utils.visitor_writer import VisitorWriter
 
 logger   = logging.getLogger("portfolio.logs")
 settings = get_settings()
 router   = APIRouter(tags=["logs"])
 
-excel            = ExcelManager("/backend/logs/visitors.xlsx")
+visitor_store    = get_visitor_store()
+visitor_writer   = VisitorWriter(visitor_store)   # group-commits rows from every request
+_event_bus       = get_event_bus()
 _email_limiter   = RateLimiter.for_email()
 _general_limiter = RateLimiter.for_general()
 
@@ -41,38 +50,43 @@ def _get_client_ip(request: Request) -> str:
         return request.client.host
     return "unknown"
 
-# Add this helper function above the route
-def _generate_and_send_email(
-    name: str,
-    role: str,
-    company: str,
-    answers: str,
-    is_hiring: bool,
-    email: str,
-):
-    """
-    Runs entirely in background after response is sent.
-    Generates AI email and delivers it — user never waits for this.
-    """
-    from app.services.email import generate_email_from_prompt, _send
-    from app.services.portfolio import build_role_aware_prompt, build_future_opportunity_prompt
-
-    prompt = (
-        build_role_aware_prompt(name, role, company, answers)
-        if is_hiring
-        else build_future_opportunity_prompt(name, role, company)
-    )
-    subject, body, model_used = generate_email_from_prompt(prompt)
-    _send(email, subject, body)
-    logger.info(f"Background email sent to {email} via {model_used}")
-    return subject, body, model_used
+
+def _publish_visitors(records: list[dict]):
+    """Store listener — push committed rows and one stats delta to /admin/stream."""
+    today = datetime.now().strftime("%Y-%m-%d")
+    delta = {"total": 0, "today": 0}
+    for record in records:
+        _event_bus.publish("visitor", record)
+        user_type        = record.get("UserType") or ""
+        delta["total"]  += 1
+        delta[user_type] = delta.get(user_type, 0) + 1
+        if str(record.get("Timestamp") or "")[:10] == today:
+            delta["today"] += 1
+    if records:
+        _event_bus.publish("stats", delta)
+
+
+def _publish_contacts(records: list[dict]):
+    """Store listener — push committed contact updates to /admin/stream."""
+    for record in records:
+        _event_bus.publish("contact", {
+            "id":        record.get("ID"),
+            "email":     record.get("Email"),
+            "github":    record.get("GitHub") or "",
+            "linkedin":  record.get("LinkedIn") or "",
+            "timestamp": record.get("Timestamp"),
+        })
+
+
+visitor_store.add_listener(_publish_visitors, ops=("append",))
+visitor_store.add_listener(_publish_contacts, ops=("update",))
+
 
 # ── Routes ─────────────────────────────────────────────────────────────────
 @router.post("/log-visitor")
 def log_visitor(
     data: User,
     request: Request,
-    background_tasks: BackgroundTasks,
     limiter: RateLimiter = Depends(lambda: _email_limiter),
 ):
     ip = _get_client_ip(request)
@@ -106,28 +120,16 @@ def log_visitor(
         ip,
     ]
 
-    # Log visitor row immediately
-    def _write_excel(r: list):
-        try:
-            excel.append_visitor(r)
-            logger.info(f"Excel write succeeded for {data.email}")
-        except Exception as e:
-            logger.warning(f"Excel write failed — Sheets is fallback. Error: {e}")
+    # Log visitor row — queued for the next group commit, never blocks;
+    # _publish_visitors streams it to /admin once it is written
+    visitor_writer.submit(row)
 
-    def _write_sheets(r: list):
-        try:
-            sheet_append(r)
-            logger.info(f"Sheets write succeeded for {data.email}")
-        except Exception as e:
-            logger.error(f"Sheets write failed. Error: {e}")
-
-    background_tasks.add_task(_write_excel, row)
-    background_tasks.add_task(_write_sheets, row)
+    # Sheets backup — buffered and batch-appended by the Sheets writer
+    sheet_append(row)
 
-    # Queue email generation + delivery as background task — never blocks response
+    # Queue email generation + delivery on the durable email queue — never blocks response
     if data.userType == "hr":
-        background_tasks.add_task(
-            _generate_and_send_email,
+        queue_visitor_email(
             data.name,
             data.role or "Hiring Manager",
             data.company,
@@ -142,7 +144,6 @@ def log_visitor(
 @router.post("/log-skip")
 def log_skip(
     request: Request,
-    background_tasks: BackgroundTasks,
     limiter: RateLimiter = Depends(lambda: _general_limiter),
 ):
     ip = _get_client_ip(request)
@@ -160,20 +161,8 @@ def log_skip(
         "", "", "", "", "", "portfolio", ip,
     ]
 
-    def _write_excel(r: list):
-        try:
-            excel.append_visitor(r)
-        except Exception as e:
-            logger.warning(f"Excel write failed for skip — Sheets is fallback. Error: {e}")
-
-    def _write_sheets(r: list):
-        try:
-            sheet_append(r)
-        except Exception as e:
-            logger.error(f"Sheets write failed for skip. Error: {e}")
-
-    background_tasks.add_task(_write_excel, row)
-    background_tasks.add_task(_write_sheets, row)
+    visitor_writer.submit(row)
+    sheet_append(row)
 
     logger.info(f"Visitor skipped from {ip}")
     return {"status": "ok"}
@@ -198,7 +187,7 @@ def contact_outreach(
     github   = info.github.strip()
     linkedin = info.linkedin.strip()
 
-    email, name_from_sheet = excel.get_latest_email()
+    email, name_from_sheet = visitor_store.get_latest_email()
     if not email:
         logger.warning("No valid email found for outreach")
         return {"status": "failed", "reason": "No email available"}
@@ -206,20 +195,14 @@ def contact_outreach(
     if not name or name.lower() == "string":
         name = name_from_sheet or "Visitor"
 
-    def _update_excel():
-        try:
-            excel.update_contact(email, github, linkedin)
-        except Exception as e:
-            logger.warning(f"Excel update_contact failed — Sheets is fallback. Error: {e}")
-
-    def _update_sheets():
+    def _update_store():
         try:
-            sheet_update_contact(email, github, linkedin)
+            visitor_store.update_contact(email, github, linkedin)
         except Exception as e:
-            logger.error(f"Sheets update_contact failed. Error: {e}")
+            logger.warning(f"Visitor store update_contact failed — Sheets is fallback. Error: {e}")
 
-    background_tasks.add_task(_update_excel)
-    background_tasks.add_task(_update_sheets)
+    background_tasks.add_task(_update_store)
+    sheet_update_contact(email, github, linkedin)   # outboxed — never blocks
 
     email_sent         = False
     github_followed    = False
@@ -233,7 +216,7 @@ def contact_outreach(
             f"looking to collaborate, you're always welcome here.\n\n"
             f"You can view Mohammed's resume here: {settings.resume_link}"
         )
-        send_email_background(background_tasks, email, subject, body)
+        queue_email(email, subject, body)
         email_sent = True
 
     if github:
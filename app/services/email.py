@@ -6,8 +6,14 @@ and provider-aware email delivery.
 EMAIL_PROVIDER=resend  → sends via Resend API       (Render hosting)
 EMAIL_PROVIDER=gmail   → sends via Gmail SMTP        (SimilieHostie shared hosting)
 
-Public interface — the only function the rest of the app calls:
-    send_email_background(background_tasks, to_email, subject, body)
+Public interface — the only functions the rest of the app calls:
+    queue_email(to_email, subject, body)
+    queue_visitor_email(name, role, company, answers, is_hiring, to_email)
+
+Both persist a job in the email queue (email_queue.py, EMAIL_QUEUE_PATH)
+and return at once; EMAIL_WORKERS threads generate and deliver, with
+retries and dead-lettering. Generation and delivery are separate jobs,
+so a failed send is retried without calling the models again.
 
 Provider selection is fully internal — nothing outside this file
 needs to know or care which provider is active.
@@ -15,14 +21,19 @@ needs to know or care which provider is active.
 
 import logging
 import smtplib
-import ssl
+from concurrent.futures import Future
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
-import requests
 import resend
-from fastapi import BackgroundTasks
-
+from resend.exceptions import ResendError
+
+from app.services.email_queue import EmailQueue
+from app.services.http_client import get_http
+from app.services.portfolio import build_future_opportunity_prompt, build_role_aware_prompt
+from app.services.resend_batcher import BatchDeliveryError, ResendBatcher
+from app.services.resend_batcher import is_retryable as resend_retryable
+from app.services.smtp_pool import SMTPPool
 from app.settings.config import EmailProvider, get_settings
 
 logger   = logging.getLogger("portfolio.email")
@@ -35,6 +46,27 @@ MODEL_PRIORITY = [
     if m.strip()
 ]
 
+# Logged-in Gmail sessions, reused across sends (EMAIL_PROVIDER=gmail only)
+smtp_pool = SMTPPool(
+    settings.email.email_host,
+    settings.email.email_port,
+    settings.email.email_user,
+    settings.email.email_pass,
+    size=settings.smtp_pool_size,
+    idle_timeout=settings.smtp_idle_timeout,
+)
+
+# Resend: key set once; bursts share one Batch.send (EMAIL_PROVIDER=resend only)
+resend.api_key = settings.resend.resend_api_key
+resend_batcher = ResendBatcher(
+    lambda messages, options: resend.Batch.send(messages, options),
+    window=settings.resend_batch_window,
+)
+
+
+class EmailConfigError(RuntimeError):
+    """The provider is not configured — retrying won't help, so the job is dead-lettered."""
+
 def _fallback_email() -> tuple[str, str, str]:
     return (
         "Let's stay connected",
@@ -61,7 +93,7 @@ def generate_email_from_prompt(prompt: str) -> tuple[str, str, str]:
 
     for model_name in MODEL_PRIORITY:
         try:
-            resp = requests.post(
+            resp = get_http().post(
                 "https://openrouter.ai/api/v1/chat/completions",
                 headers=headers,
                 json={
@@ -96,30 +128,28 @@ def generate_email_from_prompt(prompt: str) -> tuple[str, str, str]:
     return _fallback_email()
 
 # ── Provider: Resend ───────────────────────────────────────────────────────
-def _send_via_resend(to_email: str, subject: str, body: str):
+def _send_via_resend(to_email: str, subject: str, body: str) -> Future:
     """
-    Deliver via Resend API.
+    Deliver via Resend API — queued on resend_batcher, which sends each
+    burst of emails as one Batch.send and logs per-recipient results.
+    Returns the delivery Future (Resend email ID, or the error).
     Requires in .env:
         RESEND_API_KEY=re_xxxxxxxxxxxx
         RESEND_SENDER=onboarding@yourdomain.com
     """
-    try:
-        resend.api_key = settings.resend.resend_api_key
-        resend.Batch.send([{
-            "from":    settings.resend.resend_sender,
-            "to":      [to_email],
-            "subject": subject,
-            "html":    f"<p>{body.replace(chr(10), '<br>')}</p>",
-        }])
-        logger.info(f"[Resend] Email sent to {to_email}")
-    except Exception as e:
-        logger.error(f"[Resend] Failed: {e}")
+    return resend_batcher.submit({
+        "from":    settings.resend.resend_sender,
+        "to":      [to_email],
+        "subject": subject,
+        "html":    f"<p>{body.replace(chr(10), '<br>')}</p>",
+    })
 
 
 # ── Provider: Gmail ────────────────────────────────────────────────────────
 def _send_via_gmail(to_email: str, subject: str, body: str):
     """
-    Deliver via Gmail SMTP with STARTTLS.
+    Deliver via Gmail SMTP with STARTTLS, over a pooled session (smtp_pool.py).
+    Failures are logged and re-raised, so the email queue can retry them.
     Requires in .env:
         EMAIL_USER=mohammedkarabehtesham@gmail.com
         EMAIL_PASS=xxxx xxxx xxxx xxxx  ← Gmail App Password, NOT your login password
@@ -138,7 +168,7 @@ def _send_via_gmail(to_email: str, subject: str, body: str):
             "[Gmail] EMAIL_USER or EMAIL_PASS not configured — "
             "cannot send email. Check your .env file."
         )
-        return
+        raise EmailConfigError("Gmail credentials not configured")
 
     try:
         # Build MIME message with plain text + HTML alternative
@@ -153,14 +183,8 @@ def _send_via_gmail(to_email: str, subject: str, body: str):
             "html",
         ))
 
-        # Connect on port 587, upgrade to TLS via STARTTLS
-        context = ssl.create_default_context()
-        with smtplib.SMTP(settings.email.email_host, settings.email.email_port) as server:
-            server.ehlo()
-            server.starttls(context=context)
-            server.ehlo()
-            server.login(email_user, email_pass)
-            server.sendmail(email_user, to_email, msg.as_string())
+        # Pooled session: STARTTLS + login only when no live one is idle
+        smtp_pool.send(to_email, msg.as_string())
 
         logger.info(f"[Gmail] Email sent to {to_email}")
 
@@ -170,38 +194,96 @@ def _send_via_gmail(to_email: str, subject: str, body: str):
             "EMAIL_PASS must be a Gmail App Password, not your account password. "
             "Generate one at: https://myaccount.google.com/apppasswords"
         )
+        raise
     except smtplib.SMTPException as e:
         logger.error(f"[Gmail] SMTP error: {e}")
+        raise
     except Exception as e:
         logger.error(f"[Gmail] Unexpected error: {e}")
+        raise
 
 
 # ── Provider dispatcher ────────────────────────────────────────────────────
-def _send(to_email: str, subject: str, body: str):
+def _send(to_email: str, subject: str, body: str) -> Future | None:
     """
     Reads EMAIL_PROVIDER and routes to the correct sending function.
     This is the only place in the codebase that knows about providers.
+    Gmail sends before returning (raises on failure); Resend returns the
+    batcher's Future at once, and the email queue settles the job when
+    it resolves — so one worker can fill a whole batch.
     """
     if settings.email_provider == EmailProvider.GMAIL:
         _send_via_gmail(to_email, subject, body)
-    else:
-        _send_via_resend(to_email, subject, body)
+        return None
+    return _send_via_resend(to_email, subject, body)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Rejected recipients, bad credentials and missing config won't fix themselves — dead-letter them."""
+    if isinstance(error, (
+        EmailConfigError,
+        BatchDeliveryError,
+        smtplib.SMTPRecipientsRefused,
+        smtplib.SMTPAuthenticationError,
+    )):
+        return False
+    if isinstance(error, ResendError):
+        return resend_retryable(error)
+    return True
+
+
+# ── Email jobs ─────────────────────────────────────────────────────────────
+def _deliver_job(job: dict) -> Future | None:
+    return _send(job["to_email"], job["subject"], job["body"])
+
+
+def _visitor_email_job(job: dict) -> list[tuple[str, dict]]:
+    """Generate the visitor's email, then hand delivery to its own job."""
+    prompt = (
+        build_role_aware_prompt(job["name"], job["role"], job["company"], job["answers"])
+        if job["is_hiring"]
+        else build_future_opportunity_prompt(job["name"], job["role"], job["company"])
+    )
+    subject, body, model_used = generate_email_from_prompt(prompt)
+    logger.info(f"Email for {job['to_email']} generated via {model_used}")
+    return [("send", {"to_email": job["to_email"], "subject": subject, "body": body})]
+
+
+email_queue = EmailQueue(
+    settings.email_queue_path,
+    {"send": _deliver_job, "visitor": _visitor_email_job},
+    workers=settings.email_workers,
+    max_attempts=settings.email_max_attempts,
+    is_retryable=_is_retryable,
+)
 
 
 # ── Public interface ───────────────────────────────────────────────────────
-def send_email_background(
-    background_tasks: BackgroundTasks,
-    to_email: str,
-    subject: str,
-    body: str,
-):
+def queue_email(to_email: str, subject: str, body: str) -> bool:
     """
-    The only function the rest of the app calls.
-
-    Queues email delivery as a background task so the HTTP response
-    never waits for it. Provider selection happens inside _send().
+    Queue delivery of a ready email. Returns as soon as the job is stored —
+    the HTTP response never waits for the provider.
 
     Usage (identical regardless of provider):
-        send_email_background(background_tasks, data.email, subject, body)
+        queue_email(data.email, subject, body)
     """
-    background_tasks.add_task(_send, to_email, subject, body)
\ No newline at end of file
+    return email_queue.enqueue("send", {"to_email": to_email, "subject": subject, "body": body})
+
+
+def queue_visitor_email(
+    name: str,
+    role: str,
+    company: str,
+    answers: str,
+    is_hiring: bool,
+    to_email: str,
+) -> bool:
+    """Queue AI generation (role-aware if hiring) and delivery of a visitor's email."""
+    return email_queue.enqueue("visitor", {
+        "name":      name,
+        "role":      role,
+        "company":   company,
+        "answers":   answers,
+        "is_hiring": is_hiring,
+        "to_email":  to_email,
+    })
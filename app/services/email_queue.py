@@ -0,0 +1,409 @@
+"""
+email_queue.py
+Durable email job queue in SQLite, worked by a bounded pool of threads.
+
+Jobs:
+  A job is (kind, JSON payload); the handler registered for its kind
+  does the work. Handlers may return follow-up jobs ([(kind, payload)]),
+  which are inserted in the same transaction that marks the job done —
+  so "generate the email" and "deliver it" are separate steps, and a
+  failed delivery is retried without paying for the LLM call again.
+  A handler may instead return a Future (a send handed to the Resend
+  batcher): the worker moves straight on to the next job, and the job
+  is completed or failed when the Future resolves — never retried while
+  it is still pending. At most `max_inflight` such jobs are outstanding.
+
+Lifecycle (status column):
+  queued  → waiting for run_after
+  running → claimed by a worker until lease_until (renewed while the
+            job runs or its Future is pending)
+  done    → finished; pruned after `retention` seconds
+  dead    → failed `max_attempts` times, or with a non-retryable error, or
+            its worker died on the last attempt — kept, with its last
+            error, for /admin/email-queue
+
+  Claiming is one UPDATE … RETURNING, so workers in every uvicorn
+  process can share the file without double-sending. A job whose worker
+  died (crash, restart mid-send) is claimed again once its lease runs
+  out — unless that was its last attempt, in which case it is
+  dead-lettered at claim time, so a job that kills its worker every
+  time (OOM, hard crash mid-send) can't loop forever. A live process
+  renews the lease of every job it owns every `lease / 3` seconds, so a
+  slow LLM call or a long batch retry is never picked up twice.
+  Failures back off exponentially: `backoff_base` doubling up to
+  `backoff_max`, with jitter.
+
+Workers:
+  `workers` daemon threads, separate from Starlette's threadpool — a
+  30-second LLM call ties up an email worker, never a request handler.
+  enqueue() wakes an idle worker; otherwise they poll every
+  `poll_interval` seconds (retries coming due, jobs from other
+  processes). One more thread, email-housekeeper, records resolved
+  Futures, renews leases and prunes old jobs.
+
+Usage:
+    queue = EmailQueue(path, {"send": deliver}, workers=2)
+    queue.start()                        # lifespan startup
+    queue.enqueue("send", {...})         # request path — one INSERT
+    queue.status()                       # admin endpoint
+    queue.stop()                         # lifespan shutdown
+"""
+
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future
+from typing import Callable
+
+from app.utils.sqlite_conn import ThreadConnections
+
+logger = logging.getLogger("portfolio.email")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS email_jobs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind        TEXT    NOT NULL,
+    payload     TEXT    NOT NULL,
+    status      TEXT    NOT NULL DEFAULT 'queued',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    run_after   REAL    NOT NULL,
+    lease_until REAL,
+    last_error  TEXT,
+    created_at  REAL    NOT NULL,
+    updated_at  REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_email_jobs_ready ON email_jobs (status, run_after);
+"""
+
+_CLAIM = """
+UPDATE email_jobs
+   SET status = 'running', attempts = attempts + 1, lease_until = :lease, updated_at = :now
+ WHERE id = (
+       SELECT id FROM email_jobs
+        WHERE (status = 'queued'  AND run_after   <= :now)
+           OR (status = 'running' AND lease_until <= :now AND attempts < :max)
+        ORDER BY run_after, id
+        LIMIT 1)
+RETURNING id, kind, payload, attempts
+"""
+
+# Lease ran out on the final attempt — the worker died mid-job every time
+_BURY_LOST = """
+UPDATE email_jobs
+   SET status = 'dead', lease_until = NULL, updated_at = :now,
+       last_error = 'worker lost mid-job on the final attempt (lease expired)'
+ WHERE status = 'running' AND lease_until <= :now AND attempts >= :max
+RETURNING id, kind, attempts
+"""
+
+Handler = Callable[[dict], list[tuple[str, dict]] | Future | None]
+
+
+class EmailQueue:
+    def __init__(
+        self,
+        db_path: str,
+        handlers: dict[str, Handler],
+        workers: int = 2,
+        max_attempts: int = 5,
+        is_retryable: Callable[[Exception], bool] | None = None,
+        backoff_base: float = 30.0,
+        backoff_max: float = 3600.0,
+        lease: float = 300.0,
+        poll_interval: float = 5.0,
+        retention: float = 7 * 86_400,
+        max_inflight: int = 100,
+    ):
+        self.db_path       = db_path
+        self.handlers      = handlers
+        self.workers       = max(1, workers)
+        self.max_attempts  = max(1, max_attempts)
+        self.is_retryable  = is_retryable or (lambda e: True)
+        self.backoff_base  = backoff_base
+        self.backoff_max   = backoff_max
+        self.lease         = lease
+        self.poll_interval = poll_interval
+        self.retention     = retention
+        self.max_inflight  = max(1, max_inflight)
+        self._conns        = ThreadConnections(db_path)
+        self._threads: list[threading.Thread] = []
+        self._lock         = threading.Lock()
+        self._jobs_lock    = threading.Lock()
+        self._owned: set[int] = set()                       # running here: leases to renew
+        self._inflight: dict[int, sqlite3.Row] = {}         # waiting on a Future
+        self._settled: deque[tuple[sqlite3.Row, Future]] = deque()
+        self._housekeep    = threading.Event()
+        self._wake         = threading.Condition()
+        self._stopping     = threading.Event()
+        self._pruned_at    = 0.0
+        self._renewed_at   = 0.0
+        self._ready        = False
+
+    # ── Internal helpers ────────────────────────────────────────────────
+    def _conn(self) -> sqlite3.Connection:
+        conn = self._conns.get()
+        if not self._ready:
+            with conn:
+                conn.executescript(_SCHEMA)
+            self._ready = True
+        return conn
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, kind: str, payload: dict, now: float):
+        conn.execute(
+            "INSERT INTO email_jobs (kind, payload, run_after, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (kind, json.dumps(payload, ensure_ascii=False), now, now, now),
+        )
+
+    def _claim(self) -> sqlite3.Row | None:
+        now  = time.time()
+        conn = self._conn()
+        with conn:
+            buried = conn.execute(_BURY_LOST, {"now": now, "max": self.max_attempts}).fetchall()
+            rows   = conn.execute(
+                _CLAIM, {"now": now, "lease": now + self.lease, "max": self.max_attempts}
+            ).fetchall()
+        for job in buried:
+            logger.error(
+                f"Email job {job['id']} ({job['kind']}) dead-lettered: its worker was lost "
+                f"on attempt {job['attempts']} of {self.max_attempts}."
+            )
+        return rows[0] if rows else None
+
+    def _complete(self, job_id: int, follow_ups: list[tuple[str, dict]]):
+        now  = time.time()
+        conn = self._conn()
+        with conn:
+            for kind, payload in follow_ups:
+                self._insert(conn, kind, payload, now)
+            conn.execute(
+                "UPDATE email_jobs SET status = 'done', lease_until = NULL, last_error = NULL, "
+                "updated_at = ? WHERE id = ?",
+                (now, job_id),
+            )
+
+    def _fail(self, job: sqlite3.Row, error: Exception):
+        now   = time.time()
+        final = job["attempts"] >= self.max_attempts or not self.is_retryable(error)
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (job["attempts"] - 1))
+        delay *= random.uniform(0.8, 1.2)
+        conn  = self._conn()
+        with conn:
+            conn.execute(
+                "UPDATE email_jobs SET status = ?, run_after = ?, lease_until = NULL, "
+                "last_error = ?, updated_at = ? WHERE id = ?",
+                ("dead" if final else "queued", now + delay, str(error)[:1000], now, job["id"]),
+            )
+        if final:
+            logger.error(
+                f"Email job {job['id']} ({job['kind']}) dead-lettered after "
+                f"{job['attempts']} attempt(s): {error}"
+            )
+        else:
+            logger.warning(
+                f"Email job {job['id']} ({job['kind']}) failed (attempt {job['attempts']}) — "
+                f"retrying in {delay:.0f}s: {error}"
+            )
+
+    def _prune(self):
+        now = time.time()
+        if now - self._pruned_at < 3600:
+            return
+        self._pruned_at = now
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "DELETE FROM email_jobs WHERE status = 'done' AND updated_at < ?",
+                (now - self.retention,),
+            )
+
+    def _renew(self):
+        """Push out the lease of every job this process still owns."""
+        now = time.time()
+        if now - self._renewed_at < self.lease / 3:
+            return
+        self._renewed_at = now
+        with self._jobs_lock:
+            ids = list(self._owned)
+        if not ids:
+            return
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                f"UPDATE email_jobs SET lease_until = ?, updated_at = ? "
+                f"WHERE status = 'running' AND id IN ({', '.join('?' * len(ids))})",
+                (now + self.lease, now, *ids),
+            )
+
+    def _release(self, job_id: int):
+        with self._jobs_lock:
+            self._owned.discard(job_id)
+            self._inflight.pop(job_id, None)
+        with self._wake:
+            self._wake.notify()              # an in-flight slot may have opened
+
+    def _on_resolved(self, job: sqlite3.Row, future: Future):
+        """Future callback (batcher thread) — the housekeeper does the DB write."""
+        self._settled.append((job, future))
+        self._housekeep.set()
+
+    def _settle(self):
+        while self._settled:
+            job, future = self._settled.popleft()
+            try:
+                error = future.exception()
+            except CancelledError as e:
+                error = e
+            try:
+                if error is None:
+                    self._complete(job["id"], [])
+                else:
+                    self._fail(job, error)
+            finally:
+                self._release(job["id"])
+
+    def _run_one(self) -> bool:
+        """Claim and run one job. False when nothing is due."""
+        job = self._claim()
+        if job is None:
+            return False
+        with self._jobs_lock:
+            self._owned.add(job["id"])
+        handler = self.handlers.get(job["kind"])
+        try:
+            if handler is None:
+                raise ValueError(f"no handler for job kind '{job['kind']}'")
+            result = handler(json.loads(job["payload"]))
+        except Exception as e:
+            try:
+                self._fail(job, e)
+            finally:
+                self._release(job["id"])
+            return True
+        if isinstance(result, Future):
+            with self._jobs_lock:
+                self._inflight[job["id"]] = job
+            result.add_done_callback(lambda future, job=job: self._on_resolved(job, future))
+            return True
+        try:
+            self._complete(job["id"], result or [])
+        finally:
+            self._release(job["id"])
+        return True
+
+    def _saturated(self) -> bool:
+        with self._jobs_lock:
+            return len(self._inflight) >= self.max_inflight
+
+    def _work(self):
+        while not self._stopping.is_set():
+            try:
+                if not self._saturated() and self._run_one():
+                    continue
+            except Exception as e:
+                logger.error(f"Email worker error: {e}")
+            with self._wake:
+                self._wake.wait(self.poll_interval)
+
+    def _housekeeper(self):
+        """Settle resolved Futures, renew leases, prune — until stopped and drained."""
+        while True:
+            try:
+                self._settle()
+                self._renew()
+                self._prune()
+            except Exception as e:
+                logger.error(f"Email housekeeper error: {e}")
+            with self._jobs_lock:
+                busy = bool(self._owned)
+            if self._stopping.is_set() and not busy and not self._settled:
+                break
+            self._housekeep.wait(min(self.poll_interval, self.lease / 3))
+            self._housekeep.clear()
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+    def start(self):
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            if self._threads:
+                return
+            self._stopping.clear()
+            self._conn()                       # create the schema before workers race for it
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"email-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            thread = threading.Thread(target=self._housekeeper, name="email-housekeeper", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Email queue started with {self.workers} worker(s) at {self.db_path}")
+
+    def stop(self, timeout: float = 10.0):
+        """Let running jobs and pending Futures finish; queued ones stay in the file for next start."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+            self._stopping.set()
+        with self._wake:
+            self._wake.notify_all()
+        self._housekeep.set()
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        if any(t.is_alive() for t in threads):
+            logger.warning("Email workers still busy at shutdown — their jobs will be retried.")
+        else:
+            self._conns.close()                # workers' and request threads' (enqueue, status)
+
+    # ── Public API ──────────────────────────────────────────────────────
+    def enqueue(self, kind: str, payload: dict) -> bool:
+        """Persist a job and wake a worker. False (logged) if it could not be stored."""
+        try:
+            conn = self._conn()
+            with conn:
+                self._insert(conn, kind, payload, time.time())
+        except Exception as e:
+            logger.error(f"Email job '{kind}' could not be queued: {e}")
+            return False
+        with self._wake:
+            self._wake.notify()
+        return True
+
+    def status(self, dead_limit: int = 20) -> dict:
+        """Counts per status, age of the oldest waiting job, and the latest dead letters."""
+        conn   = self._conn()
+        now    = time.time()
+        counts = {"queued": 0, "running": 0, "done": 0, "dead": 0}
+        for row in conn.execute("SELECT status, COUNT(*) AS n FROM email_jobs GROUP BY status"):
+            counts[row["status"]] = row["n"]
+        oldest = conn.execute(
+            "SELECT MIN(created_at) AS t FROM email_jobs WHERE status IN ('queued', 'running')"
+        ).fetchone()["t"]
+        dead = [
+            {
+                "id":         row["id"],
+                "kind":       row["kind"],
+                "to":         json.loads(row["payload"]).get("to_email", ""),
+                "attempts":   row["attempts"],
+                "last_error": row["last_error"],
+                "failed_at":  time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row["updated_at"])),
+            }
+            for row in conn.execute(
+                "SELECT id, kind, payload, attempts, last_error, updated_at FROM email_jobs "
+                "WHERE status = 'dead' ORDER BY updated_at DESC LIMIT ?",
+                (dead_limit,),
+            )
+        ]
+        with self._jobs_lock:
+            in_flight = len(self._inflight)
+        return {
+            "workers":           self.workers,
+            "in_flight":         in_flight,
+            "counts":            counts,
+            "oldest_pending_s":  round(now - oldest, 1) if oldest else 0.0,
+            "dead":              dead,
+        }
@@ -0,0 +1,71 @@
+"""
+http_client.py
+One pooled, keep-alive HTTP session shared by the outbound API calls
+(OpenRouter email generation, GitHub follow, Autobound outreach).
+
+  - A bare requests.post/put builds a throwaway Session per call, so every
+    call pays a fresh TCP connect + TLS handshake. The shared session keeps
+    idle connections open per host and reuses them — the second model in
+    the email fallback chain, and the next visitor's email, skip both.
+  - Pool limits come from settings:
+        HTTP_POOL_CONNECTIONS → hosts with a cached pool
+        HTTP_POOL_MAXSIZE     → idle connections kept per host
+    Beyond maxsize, extra concurrent calls still go through; their
+    connections just aren't kept.
+  - Only connection failures are retried (once) — a POST that reached the
+    server is never replayed, so an LLM call can't be billed twice.
+  - Created lazily; close_http() (lifespan shutdown) closes the pooled
+    sockets. A call after that simply opens a new session.
+
+Sync only — the chatbot's async calls use httpx and are unaffected.
+"""
+
+import logging
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.settings.config import get_settings
+
+logger   = logging.getLogger("portfolio.http")
+settings = get_settings()
+
+_session: requests.Session | None = None
+_lock    = Lock()
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=settings.http_pool_connections,
+        pool_maxsize=settings.http_pool_maxsize,
+        max_retries=Retry(total=1, connect=1, read=False, status=0, redirect=0),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://",  adapter)
+    return session
+
+
+def get_http() -> requests.Session:
+    """The shared session — thread-safe for concurrent requests."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def close_http():
+    """Close pooled connections. Called from the lifespan shutdown."""
+    global _session
+    with _lock:
+        session, _session = _session, None
+    if session is not None:
+        try:
+            session.close()
+            logger.info("HTTP session closed.")
+        except Exception as e:
+            logger.warning(f"HTTP session close failed: {e}")
@@ -5,7 +5,7 @@ Both are fire-and-forget — failures are logged, not raised.
 """
 
 import logging
-import requests
+from app.services.http_client import get_http
 from app.settings.config import get_settings
 
 logger   = logging.getLogger("portfolio.outreach")
@@ -16,7 +16,7 @@ def follow_on_github(username: str):
     if not username or not settings.social.github_token:
         return
     try:
-        r = requests.put(
+        r = get_http().put(
             f"https://api.github.com/user/following/{username}",
             headers={
                 "Authorization": f"token {settings.social.github_token}",
@@ -36,7 +36,7 @@ def connect_on_linkedin(name: str, email: str):
     if not name or not settings.social.autobound_api_key:
         return
     try:
-        requests.post(
+        get_http().post(
             "https://api.autobound.ai/api/external/generate-content/v1",
             headers={
                 "X-API-KEY": settings.social.autobound_api_key,
@@ -0,0 +1,196 @@
+"""
+resend_batcher.py
+Micro-batched Resend delivery: one Batch.send call per burst of emails.
+
+  - submit(message) queues a Resend send-params dict and returns a
+    Future at once; a daemon thread collects messages for up to `window`
+    seconds after the first one (or until `max_batch`, Resend's limit of
+    100) and sends them in a single Batch.send.
+  - Batches go out in permissive validation mode, so one malformed
+    address fails alone: the response's data[] and errors[{index}] are
+    mapped back to each message's Future and logged per recipient.
+  - A whole-batch failure that may pass later (ResendError 429/5xx, a
+    network error) is retried with exponential backoff — honouring
+    Retry-After on a 429 — under the same Idempotency-Key, so Resend never delivers a retried
+    batch twice. Other failures (bad API key, 4xx, a TypeError from bad
+    params) fail every message in the batch straight away.
+  - stop() (lifespan shutdown) sends whatever is still queued. A batch
+    that is backing off when stop() is called gets one more attempt
+    straight away and then fails, rather than burning its remaining
+    retries back to back.
+
+Futures resolve to the Resend email ID or raise the delivery error;
+callers that don't care simply ignore them.
+"""
+
+import logging
+import random
+import uuid
+from concurrent.futures import Future
+from queue import Empty, Queue
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Callable
+
+import requests
+from resend.exceptions import ResendError
+
+logger = logging.getLogger("portfolio.email")
+
+RESEND_BATCH_LIMIT = 100
+
+# Transport failures that never reached Resend (the SDK wraps most as ResendError 500)
+_NETWORK_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+
+def _status(error: Exception) -> int | None:
+    """HTTP status of a ResendError (`code` may be an int or a string)."""
+    try:
+        return int(getattr(error, "code", None))
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(error: Exception) -> float | None:
+    headers = getattr(error, "headers", None) or {}
+    value   = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """ResendError 429 / 5xx, or a network error. Anything else (bad params, SDK bugs) is final."""
+    if isinstance(error, ResendError):
+        status = _status(error)
+        return status is not None and (status == 429 or status >= 500)
+    return isinstance(error, _NETWORK_ERRORS)
+
+
+class BatchDeliveryError(Exception):
+    """One message of a batch rejected by Resend (permissive validation)."""
+
+
+class ResendBatcher:
+    def __init__(
+        self,
+        send_batch: Callable[[list[dict], dict], dict],
+        max_batch: int = RESEND_BATCH_LIMIT,
+        window: float = 1.0,
+        max_attempts: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ):
+        self.send_batch   = send_batch
+        self.max_batch    = min(max_batch, RESEND_BATCH_LIMIT)
+        self.window       = window
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max  = backoff_max
+        self._queue: Queue[tuple[dict, Future]] = Queue()
+        self._thread      = None
+        self._lock        = Lock()
+        self._stopping    = Event()
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = Thread(target=self._run, name="resend-batcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Send what is queued, then stop."""
+        with self._lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return
+            self._stopping.set()
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("[Resend] Batcher did not flush before shutdown timeout.")
+
+    # ── Public API ──────────────────────────────────────────────────────
+    def submit(self, message: dict) -> Future:
+        """Queue one Resend send-params dict. Starts the sender on first use."""
+        future: Future = Future()
+        self._queue.put((message, future))
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        return future
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    # ── Sender thread ───────────────────────────────────────────────────
+    def _collect(self) -> list[tuple[dict, Future]]:
+        """Block for the first message, then gather more for `window` seconds."""
+        try:
+            batch = [self._queue.get(timeout=0.5)]
+        except Empty:
+            return []
+        deadline = monotonic() + (0 if self._stopping.is_set() else self.window)
+        while len(batch) < self.max_batch:
+            remaining = deadline - monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def _deliver(self, batch: list[tuple[dict, Future]]):
+        options  = {"batch_validation": "permissive", "idempotency_key": str(uuid.uuid4())}
+        messages = [message for message, _ in batch]
+        final    = False                 # set once shutdown cut a backoff short
+        for attempt in range(self.max_attempts):
+            try:
+                response = self.send_batch(messages, options) or {}
+                break
+            except Exception as e:
+                last_try = final or attempt + 1 >= self.max_attempts
+                if not is_retryable(e) or last_try:
+                    logger.error(f"[Resend] Batch of {len(batch)} failed: {e}")
+                    for _, future in batch:
+                        future.set_exception(e)
+                    return
+                delay = _retry_after(e) or min(self.backoff_max, self.backoff_base * 2 ** attempt)
+                delay *= random.uniform(0.8, 1.2)
+                logger.warning(f"[Resend] Batch of {len(batch)} failed ({e}) — retrying in {delay:.1f}s.")
+                # Shutdown cuts the wait short: one quick last attempt, then give up.
+                final = self._stopping.wait(delay)
+
+        errors = {err.get("index"): err.get("message", "rejected") for err in response.get("errors") or []}
+        sent   = iter(response.get("data") or [])    # accepted messages, in submit order
+        for i, (message, future) in enumerate(batch):
+            to = ", ".join(message.get("to") or [])
+            if i in errors:
+                logger.error(f"[Resend] Rejected email to {to}: {errors[i]}")
+                future.set_exception(BatchDeliveryError(errors[i]))
+                continue
+            email_id = (next(sent, None) or {}).get("id")
+            logger.info(f"[Resend] Email sent to {to}" + (f" ({email_id})" if email_id else ""))
+            future.set_result(email_id)
+        if len(batch) > 1:
+            logger.info(f"[Resend] Batch of {len(batch)} sent in one call ({len(errors)} rejected).")
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch:
+                try:
+                    self._deliver(batch)
+                except Exception as e:
+                    logger.error(f"[Resend] Batch delivery crashed: {e}")
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+            elif self._stopping.is_set():
+                return
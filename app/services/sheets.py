@@ -1,11 +1,42 @@
 """
 sheets.py
-Google Sheets backup — initialised once at startup via init_sheets().
+Google Sheets backup — connected in the background by init_sheets().
 All writes are best-effort: failures are logged, never raised.
+
+Connection:
+  init_sheets() only starts a "sheets-connect" thread (credentials,
+  gspread.authorize, open by name — several Google round trips), so
+  startup never waits on Google; it retries with backoff until it
+  succeeds. Writes made meanwhile sit in the outbox and are drained once
+  the sheet is open. A call that fails with 401/403/404 or a transport
+  error drops the handle as stale and reconnects in the background.
+
+Writes (appends and contact updates) go through sheets_writer: they are
+recorded in a durable outbox under /backend/logs and replayed by a
+background drainer — appends batched with append_rows, retried with
+backoff, deduplicated by ID (see app/services/sheets_writer.py).
+Start/stop it from the lifespan.
+
+Reads go through sheets_mirror, an in-memory copy of the sheet kept
+current by delta sync (see app/services/sheets_mirror.py) — admin reads
+and contact-update lookups never download the whole sheet.
 """
 
 import logging
+import re
+from datetime import datetime
+from threading import Event, Lock, Thread
+
+from app.services.sheets_mirror import SheetsMirror, col_letter
+from app.services.sheets_writer import SheetsUnavailable, SheetsWriter, http_status
 from app.settings.config import get_settings
+from app.utils.excel_manager import HEADERS
+
+try:
+    from google.auth.exceptions import RefreshError, TransportError
+    _AUTH_STALE: tuple = (RefreshError, TransportError)
+except ImportError:
+    _AUTH_STALE = ()
 
 logger   = logging.getLogger("portfolio.sheets")
 settings = get_settings()
@@ -13,71 +44,245 @@ settings = get_settings()
 _sheet    = None
 SHEETS_OK = False
 
+_connect_lock   = Lock()
+_connect_thread = None
+_shutdown       = Event()
 
-def init_sheets():
+
+# ── Connection ─────────────────────────────────────────────────────────────
+def _configured() -> bool:
+    return bool(settings.api.google_cred_path and settings.api.sheet_name)
+
+
+def _connected() -> bool:
+    return SHEETS_OK and _sheet is not None
+
+
+def _connect():
     global _sheet, SHEETS_OK
 
-    if not settings.api.google_cred_path or not settings.api.sheet_name:
+    import gspread
+    from google.oauth2.service_account import Credentials  # modern library
+
+    scopes = [
+        "https://spreadsheets.google.com/feeds",
+        "https://www.googleapis.com/auth/drive",
+    ]
+    creds     = Credentials.from_service_account_file(
+        settings.api.google_cred_path,
+        scopes=scopes,           # correct param name for google-auth
+    )
+    client = gspread.authorize(creds)
+    sheet  = client.open(settings.api.sheet_name).sheet1
+    with _connect_lock:           # don't race _drop_connection from the writer threads
+        _sheet, SHEETS_OK = sheet, True
+    logger.info("Google Sheets backup connected.")
+    sheets_mirror.invalidate()
+    sheets_writer.wake()          # drain whatever was buffered while connecting
+
+
+def _connect_loop():
+    delay = 1.0
+    while not _shutdown.is_set():
+        try:
+            _connect()
+            return
+        except Exception as e:
+            logger.warning(f"Google Sheets unavailable — retrying in {delay:.0f}s: {e}")
+            _shutdown.wait(delay)
+            delay = min(delay * 2, 300.0)
+
+
+def _ensure_connecting():
+    """Start the background connect unless connected or already connecting."""
+    global _connect_thread
+    if not _configured() or _connected() or _shutdown.is_set():
+        return
+    with _connect_lock:
+        if _connect_thread is not None and _connect_thread.is_alive():
+            return
+        _connect_thread = Thread(target=_connect_loop, name="sheets-connect", daemon=True)
+        _connect_thread.start()
+
+
+def _is_stale(error: Exception) -> bool:
+    """Errors a fresh client/handle can fix: auth, a moved sheet, a dead transport."""
+    if http_status(error) in (401, 403, 404):
+        return True
+    return isinstance(error, (OSError, *_AUTH_STALE))
+
+
+def _drop_connection(error: Exception, sheet=None):
+    """Forget a stale handle and reconnect in the background."""
+    global _sheet, SHEETS_OK
+    with _connect_lock:
+        if sheet is not None and _sheet is not sheet:
+            return                    # already replaced by a newer connection
+        _sheet, SHEETS_OK = None, False
+    logger.warning(f"Google Sheets handle went stale ({error}) — reconnecting.")
+    _ensure_connecting()
+
+
+def _on_sheet_error(error: Exception):
+    if _is_stale(error):
+        _drop_connection(error)
+
+
+def init_sheets():
+    """Connect in the background — returns at once; startup never waits on Google."""
+    if not _configured():
         logger.warning("Google Sheets not configured — backup disabled.")
         return
+    _shutdown.clear()
+    _ensure_connecting()
 
-    try:
-        import gspread
-        from google.oauth2.service_account import Credentials  # modern library
-
-        scopes = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        creds     = Credentials.from_service_account_file(
-            settings.api.google_cred_path,
-            scopes=scopes,           # correct param name for google-auth
-        )
-        client    = gspread.authorize(creds)
-        _sheet    = client.open(settings.api.sheet_name).sheet1
-        SHEETS_OK = True
-        logger.info("Google Sheets backup connected.")
 
+def close_sheets():
+    """Stop reconnect attempts — called at shutdown."""
+    _shutdown.set()
+
+
+def _require_sheet():
+    sheet = _sheet
+    if not SHEETS_OK or sheet is None:
+        _ensure_connecting()
+        raise SheetsUnavailable("Google Sheets not connected")
+    return sheet
+
+
+def _call(fn):
+    """
+    Run fn(sheet). A stale-handle failure triggers a reconnect and is
+    re-raised without its HTTP status, so the outbox retries it once the
+    new connection is up instead of dropping it.
+    """
+    sheet = _require_sheet()
+    try:
+        return fn(sheet)
     except Exception as e:
-        logger.warning(f"Google Sheets unavailable: {e}")
+        if not _is_stale(e):
+            raise
+        _drop_connection(e, sheet)
+        raise SheetsUnavailable(f"Google Sheets handle went stale: {e}") from e
+
+
+# ── Sheet operations ───────────────────────────────────────────────────────
+_RANGE_START = re.compile(r"![A-Z]+(\d+)")
+
+
+def _append_rows(rows: list[list]):
+    """
+    One append_rows call per batch. Raises, so the writer can retry.
+    The rows land in the mirror at the row numbers Google reports, so a
+    contact update that follows finds them straight away.
+    """
+    response = _call(lambda sheet: sheet.append_rows(rows))
+    updated  = ((response or {}).get("updates") or {}).get("updatedRange") or ""
+    match    = _RANGE_START.search(updated)
+    if match:
+        sheets_mirror.appended(int(match.group(1)), rows)
+
+
+sheets_mirror = SheetsMirror(
+    _require_sheet,
+    sync_interval=settings.sheets_sync_interval,
+    checksum_interval=settings.sheets_checksum_interval,
+    index_header="Email",
+    index_col=HEADERS.index("Email") + 1,
+    on_error=_on_sheet_error,
+)
+
+# Sheet columns follow HEADERS — 1-based column numbers for contact updates
+_COL = {h: HEADERS.index(h) + 1 for h in ("Email", "Timestamp", "GitHub", "LinkedIn")}
+
+
+def _email_at(sheet, row: int) -> str:
+    return sheet.acell(f"{col_letter(_COL['Email'])}{row}").value or ""
+
+
+def _verified_row(sheet, email: str) -> int | None:
+    """
+    Mirror row for email, confirmed against the live Email cell. Rows
+    deleted or sorted by hand leave the mirror off until its next checksum;
+    on a mismatch it is fully resynced and the row looked up again, so an
+    update never lands on another visitor's row.
+    """
+    row = sheets_mirror.row_for(email, strict=True)
+    if row is None or _email_at(sheet, row) == email:
+        return row
+    logger.warning(f"Sheets: mirror row {row} no longer holds {email} — resyncing.")
+    sheets_mirror.resync()
+    row = sheets_mirror.row_for(email, strict=True)
+    if row is None or _email_at(sheet, row) == email:
+        return row
+    raise SheetsUnavailable(f"Sheet is changing under the mirror — row for {email} unconfirmed")
+
+
+def _update_contact_row(op: dict):
+    """
+    Apply one outboxed contact update: row found through the mirror's
+    Email index and checked against the live Email cell, then
+    GitHub/LinkedIn/Timestamp written in one batch_update.
+    Raises, so the writer can retry — including when the mirror can't
+    sync, so a Sheets hiccup never turns into a skipped update.
+    """
+    row = _call(lambda sheet: _verified_row(sheet, op["email"]))
+    if row is None:
+        logger.info(f"Sheets: no row for {op['email']} — contact update skipped")
+        return
+    cells = {_COL["Timestamp"]: op["timestamp"]}
+    if op.get("github"):
+        cells[_COL["GitHub"]] = f"https://github.com/{op['github']}"
+    if op.get("linkedin"):
+        cells[_COL["LinkedIn"]] = f"https://linkedin.com/in/{op['linkedin']}"
+    _call(lambda sheet: sheet.batch_update([
+        {"range": f"{col_letter(col)}{row}", "values": [[value]]}
+        for col, value in cells.items()
+    ]))
+    sheets_mirror.apply(row, cells)
+
+
+def _existing_ids() -> set[str]:
+    """IDs already in the sheet (column A) — lets the outbox skip rows it already sent."""
+    return {str(v) for v in _call(lambda sheet: sheet.col_values(1))[1:]}
+
+
+sheets_writer = SheetsWriter(
+    settings.storage.sheets_outbox_path,
+    _append_rows,
+    _update_contact_row,
+    _existing_ids,
+    ready=_connected,
+)
 
 
 def sheet_append(row: list):
-    if not SHEETS_OK or _sheet is None:
+    """Record a row in the Sheets outbox — never blocks on Google."""
+    if not _configured():
         return
-    try:
-        _sheet.append_row(row)
-    except Exception as e:
-        logger.warning(f"Sheet append failed: {e}")
+    sheets_writer.submit(row)
 
 
 def sheet_update_contact(email: str, github: str, linkedin: str):
-    if not SHEETS_OK or _sheet is None:
+    """Record a contact update in the Sheets outbox — never blocks on Google."""
+    if not _configured():
         return
-    try:
-        from datetime import datetime
-        rows = _sheet.get_all_records()
-        for i, row in enumerate(rows, start=2):
-            if row.get("email") == email:
-                if github:
-                    _sheet.update_cell(i, 12, f"https://github.com/{github}")
-                if linkedin:
-                    _sheet.update_cell(i, 13, f"https://linkedin.com/in/{linkedin}")
-                _sheet.update_cell(i, 9, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-                return
-    except Exception as e:
-        logger.warning(f"Sheet update_contact failed: {e}")
-        
+    sheets_writer.submit_update(
+        email, github, linkedin, datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    )
+
+
 def get_all_from_sheets() -> list[dict]:
     """
-    Read all visitor records from Google Sheets.
+    Read all visitor records from the local Sheets mirror (delta-synced).
     Returns empty list if Sheets is unavailable or has no data.
     Called by admin_router to merge with Excel records.
     """
-    if not SHEETS_OK or _sheet is None:
+    if not _connected():
+        _ensure_connecting()
         return []
     try:
-        return _sheet.get_all_records()
+        return sheets_mirror.records()
     except Exception as e:
         logger.warning(f"Sheet read failed: {e}")
         return []
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""
+sheets_mirror.py
+In-memory mirror of the Google Sheet, kept current by delta sync.
+
+  - First sync downloads the sheet once (get_all_values).
+  - After that, a sync only asks for rows past the last known row —
+    one small ranged read, usually empty — since the sheet is append-only
+    from our side.
+  - Every `checksum_interval` seconds a sync downloads the full sheet
+    instead and compares its hash with the mirror's; a mismatch (rows
+    edited or deleted by hand) replaces the mirror.
+  - Syncs run at most once per `sync_interval`; between them reads are
+    served straight from memory. A failed sync keeps the last good mirror.
+  - `index_header` (matched case-insensitively) is indexed value → sheet
+    row number, later rows winning, so row_for(email) is a dict lookup.
+    row_for(..., strict=True) forces a sync on a miss and raises if that
+    sync fails, so a caller can retry rather than act on a stale "no row".
+  - appended(first_row, rows) records rows we just wrote ourselves, so a
+    contact update right after a visitor's append finds its row without
+    waiting for the next sync.
+
+Consumers: get_all_from_sheets (admin merge) and the contact-update row
+lookup — neither downloads the sheet any more.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from threading import Lock
+from typing import Callable
+
+logger = logging.getLogger("portfolio.sheets")
+
+
+def col_letter(n: int) -> str:
+    """1 → A, 27 → AA."""
+    letters = ""
+    while n > 0:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _digest(values: list[list]) -> str:
+    return hashlib.sha256(json.dumps(values, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class SheetsMirror:
+    def __init__(
+        self,
+        get_sheet: Callable[[], object],
+        sync_interval: float = 10.0,
+        checksum_interval: float = 300.0,
+        index_header: str = "Email",
+        index_col: int = 3,
+        on_error: Callable[[Exception], None] | None = None,
+    ):
+        self.get_sheet         = get_sheet
+        self.sync_interval     = sync_interval
+        self.checksum_interval = checksum_interval
+        self.index_header      = index_header
+        self.index_col         = index_col   # 1-based fallback when the header row lacks index_header
+        self.on_error          = on_error
+        self._headers: list[str]  = []
+        self._rows:    list[list] = []    # data rows; sheet row number = index + 2
+        self._row_of:  dict[str, int] = {}
+        self._synced_at   = 0.0
+        self._checked_at  = 0.0
+        self._lock        = Lock()
+
+    # ── Internal helpers ────────────────────────────────────────────────
+    def _fit(self, row: list) -> list:
+        """Pad/trim to the header width — the API drops trailing empty cells."""
+        width = len(self._headers)
+        row   = ["" if v is None else str(v) for v in row[:width]]
+        return row + [""] * (width - len(row))
+
+    def _index_pos(self) -> int:
+        wanted = self.index_header.strip().lower()
+        for i, h in enumerate(self._headers):
+            if h.strip().lower() == wanted:
+                return i
+        return self.index_col - 1
+
+    def _index(self, start: int = 0):
+        """Index rows from position `start` on. Caller holds self._lock."""
+        pos = self._index_pos()
+        for i in range(start, len(self._rows)):
+            row = self._rows[i]
+            if pos < len(row) and row[pos]:
+                self._row_of[row[pos]] = i + 2
+
+    def _full_sync(self, sheet):
+        values  = sheet.get_all_values()
+        headers = [str(h) for h in values[0]] if values else []
+        if headers != self._headers:
+            self._headers = headers
+            self._rows    = []
+        rows = [self._fit(r) for r in values[1:]]
+        if _digest(rows) != _digest(self._rows):
+            if self._rows:
+                logger.info("Sheets mirror: checksum mismatch — reloaded from the sheet.")
+            self._rows   = rows
+            self._row_of = {}
+            self._index()
+        self._checked_at = time.monotonic()
+
+    def _delta_sync(self, sheet):
+        start = len(self._rows) + 2
+        last  = col_letter(max(len(self._headers), 1))
+        fresh = sheet.get(f"A{start}:{last}")
+        if fresh:
+            start = len(self._rows)
+            self._rows.extend(self._fit(r) for r in fresh)
+            self._index(start)
+            logger.info(f"Sheets mirror: {len(fresh)} new row(s) synced.")
+
+    def _sync(self, force: bool = False, strict: bool = False):
+        """Caller holds self._lock. strict → re-raise a failed sync."""
+        now = time.monotonic()
+        if not force and now - self._synced_at < self.sync_interval:
+            return
+        try:
+            sheet = self.get_sheet()
+            if not self._headers or now - self._checked_at >= self.checksum_interval:
+                self._full_sync(sheet)
+            else:
+                self._delta_sync(sheet)
+            self._synced_at = time.monotonic()
+        except Exception as e:
+            logger.warning(f"Sheets mirror sync failed — serving last known rows: {e}")
+            if self.on_error is not None:
+                self.on_error(e)
+            if strict:
+                raise
+
+    def _record(self, row: list) -> dict:
+        return {h: (row[i] if i < len(row) else "") for i, h in enumerate(self._headers)}
+
+    # ── Public API ──────────────────────────────────────────────────────
+    def records(self) -> list[dict]:
+        """All data rows as dicts keyed by the header row (like get_all_records)."""
+        with self._lock:
+            self._sync()
+            return [self._record(r) for r in self._rows]
+
+    def row_for(self, value: str, strict: bool = False) -> int | None:
+        """
+        Sheet row number of the latest row whose index column equals value.
+        strict → on a miss, sync now (not at the next interval) and raise
+        if the sheet can't be read, instead of returning a stale None.
+        """
+        with self._lock:
+            self._sync()
+            row = self._row_of.get(value)
+            if row is None and strict:
+                self._sync(force=True, strict=True)
+                row = self._row_of.get(value)
+            return row
+
+    def headers(self) -> list[str]:
+        with self._lock:
+            self._sync()
+            return list(self._headers)
+
+    def appended(self, first_row: int, rows: list[list]):
+        """
+        Mirror rows we just appended at sheet row `first_row` onward. If they
+        follow straight on from the mirror they are added; if rows written
+        elsewhere sit in between, only their index entries are recorded and
+        the next sync fills in the gap.
+        """
+        with self._lock:
+            if not self._headers:
+                return                                  # first sync will read them
+            start = len(self._rows)
+            if first_row == start + 2:
+                self._rows.extend(self._fit(r) for r in rows)
+                self._index(start)
+                return
+            pos = self._index_pos()
+            for i, row in enumerate(rows):
+                if pos < len(row) and row[pos]:
+                    self._row_of[str(row[pos])] = first_row + i
+
+    def apply(self, row_number: int, cells: dict[int, str]):
+        """
+        Mirror a write we just made ({column number: value}), so the next
+        checksum doesn't mistake it for a manual edit.
+        """
+        with self._lock:
+            i = row_number - 2
+            if not 0 <= i < len(self._rows):
+                return
+            for col, value in cells.items():
+                if 1 <= col <= len(self._headers):
+                    self._rows[i][col - 1] = value
+
+    def resync(self):
+        """Full, checksummed sync now — raises if the sheet can't be read."""
+        with self._lock:
+            self._checked_at = 0.0
+            self._sync(force=True, strict=True)
+
+    def invalidate(self):
+        """Next read does a full, checksummed sync."""
+        with self._lock:
+            self._synced_at  = 0.0
+            self._checked_at = 0.0
@@ -0,0 +1,307 @@
+"""
+sheets_writer.py
+Durable, batched Google Sheets writes through a local outbox.
+
+Outbox:
+  Every Sheets mutation is first appended to a journal under /backend/logs
+  (SHEETS_OUTBOX_PATH, a VisitorJournal):
+      {"op": "append", "row": [...]}
+      {"op": "update", "email": ..., "github": ..., "linkedin": ..., "timestamp": ...}
+  submit()/submit_update() return as soon as that line is written — the
+  request path never waits on Google. The byte offset of the last record
+  Google has acknowledged lives next to it in <outbox>.offset, and the
+  journal is truncated once everything in it has been sent.
+
+Drainer:
+  A daemon thread replays the outbox in order. Consecutive appends go out
+  as one append_rows call (up to `max_batch` rows; a burst is given
+  `max_wait` seconds to accumulate); updates are sent one by one. The
+  offset is persisted after every acknowledged batch, so a restart resumes
+  exactly where the last process stopped.
+
+  While `ready()` is false (Sheets still connecting) the drainer leaves
+  the outbox alone; wake() it once the connection is up.
+
+  Only failures known to be transient — 429, 5xx, transport errors,
+  SheetsUnavailable (not connected yet, stale handle) — keep the batch
+  and retry after an exponential backoff (`backoff_base` doubling up to
+  `backoff_max`, with jitter). Anything else — a 4xx on a malformed row,
+  or a KeyError/TypeError from a bad op — is logged and skipped, so one
+  bad record can't wedge the strictly ordered outbox.
+
+Idempotency:
+  An append whose fate is unknown (crash between Google's ack and the
+  offset write, or a timeout) would otherwise be sent twice. After a
+  start or any failed send the drainer fetches the ID column once and
+  drops rows whose ID is already in the sheet. Contact updates set
+  absolute values, so replaying them is harmless.
+
+Concurrency:
+  Outbox appends and truncation are serialised across processes by an
+  flock on <outbox>.lock; only one process drains at a time
+  (<outbox>.drain.lock, non-blocking — the others just skip a round).
+
+Usage:
+    writer = SheetsWriter(path, send_rows, send_update, existing_ids)
+    writer.start()          # lifespan startup — also resumes a leftover outbox
+    writer.submit(row)      # request path — never blocks on Google
+    writer.stop()           # lifespan shutdown — one last drain attempt
+"""
+
+import json
+import logging
+import os
+import random
+from threading import Event, Lock, Thread
+from typing import Callable
+
+import requests
+
+from app.utils.file_lock import FileLock
+from app.utils.visitor_journal import VisitorJournal
+
+try:
+    from google.auth.exceptions import TransportError
+    _GOOGLE_TRANSIENT: tuple = (TransportError,)
+except ImportError:
+    _GOOGLE_TRANSIENT = ()
+
+logger = logging.getLogger("portfolio.sheets")
+
+
+class SheetsUnavailable(RuntimeError):
+    """Sheets not connected (yet), or the handle went stale — retry once reconnected."""
+
+
+# Errors worth retrying when they carry no HTTP status
+_TRANSIENT = (
+    SheetsUnavailable,
+    ConnectionError,                         # builtin: refused / reset / aborted
+    TimeoutError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    *_GOOGLE_TRANSIENT,
+)
+
+
+def http_status(error: Exception) -> int | None:
+    """HTTP status of a Sheets error (gspread APIError carries the response)."""
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if status is not None else getattr(error, "code", None)
+
+
+def is_rate_limited(error: Exception) -> bool:
+    return http_status(error) == 429
+
+
+def is_retryable(error: Exception) -> bool:
+    """429 / 5xx, or a known transient error (transport, SheetsUnavailable). Nothing else."""
+    status = http_status(error)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(error, _TRANSIENT)
+
+
+class SheetsWriter:
+    def __init__(
+        self,
+        outbox_path: str,
+        send_rows: Callable[[list[list]], None],
+        send_update: Callable[[dict], None],
+        existing_ids: Callable[[], set[str]],
+        ready: Callable[[], bool] | None = None,
+        max_batch: int = 100,
+        max_wait: float = 2.0,
+        poll_interval: float = 30.0,
+        backoff_base: float = 1.0,
+        backoff_max: float = 300.0,
+    ):
+        self.send_rows     = send_rows
+        self.send_update   = send_update
+        self.existing_ids  = existing_ids
+        self.ready         = ready
+        self.max_batch     = max_batch
+        self.max_wait      = max_wait
+        self.poll_interval = poll_interval
+        self.backoff_base  = backoff_base
+        self.backoff_max   = backoff_max
+        self.outbox        = VisitorJournal(outbox_path)
+        self._offset_path  = outbox_path + ".offset"
+        self._file_lock    = FileLock(outbox_path + ".lock")
+        self._drain_lock   = FileLock(outbox_path + ".drain.lock")
+        self._thread       = None
+        self._lock         = Lock()
+        self._wake         = Event()
+        self._stopping     = Event()
+        self._check_ids    = True    # fate of earlier sends unknown until proven otherwise
+        self._attempts     = 0
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._wake.set()          # drain whatever a previous process left behind
+            self._thread = Thread(target=self._run, name="sheets-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """One last drain attempt, then stop. Anything unsent stays in the outbox."""
+        with self._lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return
+            self._stopping.set()
+            self._wake.set()
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Sheets writer did not drain before shutdown timeout.")
+        self.outbox.close()
+
+    # ── Public API ──────────────────────────────────────────────────────
+    def submit(self, row: list):
+        """Record a row append in the outbox. Starts the drainer on first use."""
+        self._enqueue({"op": "append", "row": row})
+
+    def submit_update(self, email: str, github: str, linkedin: str, timestamp: str):
+        """Record a contact update in the outbox."""
+        self._enqueue({
+            "op":        "update",
+            "email":     email,
+            "github":    github,
+            "linkedin":  linkedin,
+            "timestamp": timestamp,
+        })
+
+    def wake(self):
+        """Drain now rather than at the next poll — e.g. once Sheets connects."""
+        self._wake.set()
+
+    def pending(self) -> int:
+        """Bytes of outbox not yet acknowledged by Google."""
+        return max(0, self.outbox.size() - self._load_offset())
+
+    # ── Offset bookkeeping ──────────────────────────────────────────────
+    def _enqueue(self, op: dict):
+        try:
+            with self._file_lock.exclusive():
+                self.outbox.append([op])
+        except Exception as e:
+            logger.error(f"Sheets outbox write failed — mutation lost: {e}")
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        self._wake.set()
+
+    def _load_offset(self) -> int:
+        try:
+            with open(self._offset_path, "r", encoding="utf-8") as f:
+                return int(json.load(f).get("offset", 0))
+        except (OSError, ValueError, AttributeError):
+            return 0
+
+    def _save_offset(self, offset: int):
+        tmp_path = self._offset_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"offset": offset}, f)
+        os.replace(tmp_path, self._offset_path)
+
+    def _ack(self, offset: int):
+        """Persist progress; truncate the outbox once it is fully sent."""
+        with self._file_lock.exclusive():
+            if offset >= self.outbox.size():
+                self.outbox.truncate()
+                offset = 0
+            self._save_offset(offset)
+
+    # ── Drainer thread ──────────────────────────────────────────────────
+    def _next_batch(self) -> tuple[list[dict], int]:
+        """
+        The next run of ops to send from the acknowledged offset — up to
+        `max_batch` consecutive appends, or a single update — and the
+        offset just past them.
+        """
+        with self._file_lock.shared():
+            offset = self._load_offset()
+            if offset > self.outbox.size():
+                offset = 0                     # truncated under us
+            entries = self.outbox.read_entries(offset, self.max_batch)
+        if not entries:
+            return [], offset
+        if entries[0][0].get("op") != "append":
+            return [entries[0][0]], entries[0][1]
+        ops, end = [], offset
+        for op, op_end in entries:
+            if op.get("op") != "append":
+                break
+            ops.append(op)
+            end = op_end
+        return ops, end
+
+    def _send(self, ops: list[dict]):
+        if ops[0].get("op") != "append":
+            self.send_update(ops[0])
+            return
+        rows = [op.get("row") or [] for op in ops]
+        if self._check_ids:
+            sent = self.existing_ids()
+            fresh = [r for r in rows if not r or str(r[0]) not in sent]
+            if len(fresh) < len(rows):
+                logger.info(f"Sheets outbox: {len(rows) - len(fresh)} row(s) already in the sheet — skipped.")
+            rows = fresh
+            self._check_ids = False
+        if rows:
+            self.send_rows(rows)
+            logger.info(f"Sheets outbox: appended batch of {len(rows)} row(s).")
+
+    def _drain(self) -> float:
+        """Send until the outbox is empty. Returns a backoff delay if a send must be retried."""
+        if self.ready is not None and not self.ready():
+            return 0.0                         # buffered until Sheets connects
+        with self._drain_lock.try_exclusive() as held:
+            if not held:
+                return 0.0                     # another worker is draining
+            while True:
+                ops, end = self._next_batch()
+                if not ops:
+                    if end:
+                        self._ack(end)
+                    return 0.0
+                try:
+                    self._send(ops)
+                except Exception as e:
+                    self._check_ids = True     # the append may have landed anyway
+                    if not is_retryable(e):
+                        logger.error(f"Sheets outbox: dropping {len(ops)} op(s) after non-retryable error: {e}")
+                        self._ack(end)
+                        continue
+                    delay = min(self.backoff_max, self.backoff_base * 2 ** self._attempts)
+                    delay *= random.uniform(0.5, 1.0)
+                    self._attempts += 1
+                    logger.warning(f"Sheets outbox: send failed ({e}) — retrying in {delay:.1f}s.")
+                    return delay
+                self._attempts = 0
+                self._ack(end)
+
+    def _run(self):
+        delay = 0.0
+        while not self._stopping.is_set():
+            if delay:
+                self._stopping.wait(delay)
+            else:
+                self._wake.wait(self.poll_interval)
+                self._stopping.wait(self.max_wait)   # let a burst accumulate
+            self._wake.clear()
+            if self._stopping.is_set():
+                break
+            try:
+                delay = self._drain()
+            except Exception as e:
+                logger.error(f"Sheets outbox drain failed: {e}")
+                delay = self.backoff_max
+        try:
+            self._drain()
+        except Exception as e:
+            logger.error(f"Sheets outbox final drain failed: {e}")
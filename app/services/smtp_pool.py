@@ -0,0 +1,188 @@
+"""
+smtp_pool.py
+Small pool of authenticated SMTP sessions for the Gmail provider.
+
+  - A connection costs a TCP connect, EHLO, STARTTLS (TLS handshake),
+    EHLO again and LOGIN — several round trips before a single byte of
+    mail. Pooled sessions stay logged in, so in a burst only the first
+    email pays for that; the rest go straight to MAIL FROM.
+  - At most `size` sessions exist at once; a send that finds them all
+    busy waits for one (sends are short, and Gmail frowns on many
+    parallel sessions from one account).
+  - Liveness: a session that has sat idle for more than `noop_after`
+    seconds is probed with NOOP before use; one idle for more than
+    `idle_timeout`, or that has sent `max_messages`, is closed instead
+    (Gmail drops idle sessions after a few minutes anyway).
+  - Reconnect on failure: if a reused session turns out to be dead
+    mid-send (disconnect, 421, socket error) it is thrown away and the
+    message is sent once more on a fresh one. Errors on a fresh session,
+    and SMTP rejections (bad auth, refused recipient), are raised to the
+    caller unchanged.
+
+Usage:
+    pool = SMTPPool(host, port, user, password)
+    pool.send(to_email, msg.as_string())
+    pool.close()            # lifespan shutdown
+"""
+
+import logging
+import smtplib
+import ssl
+import time
+from threading import BoundedSemaphore, Lock
+
+logger = logging.getLogger("portfolio.email")
+
+# A reused session that fails like this was most likely dropped while idle
+_STALE_ERRORS = (smtplib.SMTPServerDisconnected, OSError)
+
+
+def _is_smtp_error(error: Exception) -> bool:
+    """SMTPException subclasses OSError — only disconnects and socket errors are stale."""
+    return isinstance(error, smtplib.SMTPException) and not isinstance(error, smtplib.SMTPServerDisconnected)
+
+
+class _Session:
+    def __init__(self, server: smtplib.SMTP):
+        self.server    = server
+        self.last_used = time.monotonic()
+        self.sent      = 0
+
+
+class SMTPPool:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str | None,
+        password: str | None,
+        size: int = 2,
+        idle_timeout: float = 120.0,
+        noop_after: float = 5.0,
+        max_messages: int = 100,
+        timeout: float = 30.0,
+    ):
+        self.host         = host
+        self.port         = port
+        self.user         = user
+        self.password     = password
+        self.idle_timeout = idle_timeout
+        self.noop_after   = noop_after
+        self.max_messages = max_messages
+        self.timeout      = timeout
+        self._idle: list[_Session] = []
+        self._slots       = BoundedSemaphore(max(1, size))
+        self._lock        = Lock()
+        self._context     = ssl.create_default_context()
+
+    # ── Internal helpers ────────────────────────────────────────────────
+    def _connect(self) -> _Session:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            server.starttls(context=self._context)
+            server.ehlo()
+            server.login(self.user, self.password)
+        except Exception:
+            self._quit(server)
+            raise
+        logger.info(f"[Gmail] SMTP session opened to {self.host}:{self.port}")
+        return _Session(server)
+
+    @staticmethod
+    def _quit(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _usable(self, session: _Session) -> bool:
+        idle = time.monotonic() - session.last_used
+        if idle > self.idle_timeout or session.sent >= self.max_messages:
+            self._quit(session.server)
+            return False
+        if idle <= self.noop_after:
+            return True
+        try:
+            if session.server.noop()[0] == 250:
+                return True
+        except Exception:
+            pass
+        self._quit(session.server)
+        return False
+
+    def _checkout(self) -> tuple[_Session, bool]:
+        """A live session (newest idle one first) and whether it was reused."""
+        while True:
+            with self._lock:
+                session = self._idle.pop() if self._idle else None
+            if session is None:
+                return self._connect(), False
+            if self._usable(session):
+                return session, True
+
+    def _checkin(self, session: _Session):
+        session.last_used = time.monotonic()
+        with self._lock:
+            self._idle.append(session)
+
+    # ── Public API ──────────────────────────────────────────────────────
+    def send(self, to_email: str, message: str):
+        """Send one message from `user`. Raises smtplib errors like sendmail()."""
+        with self._slots:
+            session, reused = self._checkout()
+            try:
+                session.server.sendmail(self.user, to_email, message)
+            except smtplib.SMTPResponseException as e:
+                if not (reused and e.smtp_code == 421):
+                    self._discard_or_keep(session, e)
+                    raise
+                self._quit(session.server)
+                logger.info("[Gmail] Pooled SMTP session closed by server — reconnecting.")
+                session = self._retry(to_email, message)
+            except smtplib.SMTPRecipientsRefused:
+                self._checkin(session)       # the session itself is fine
+                raise
+            except _STALE_ERRORS as e:
+                self._quit(session.server)
+                if not reused or _is_smtp_error(e):
+                    raise
+                logger.info("[Gmail] Pooled SMTP session went stale — reconnecting.")
+                session = self._retry(to_email, message)
+            except Exception:
+                self._quit(session.server)
+                raise
+            session.sent += 1
+            self._checkin(session)
+
+    def _retry(self, to_email: str, message: str) -> _Session:
+        session = self._connect()
+        try:
+            session.server.sendmail(self.user, to_email, message)
+        except Exception:
+            self._quit(session.server)
+            raise
+        return session
+
+    def _discard_or_keep(self, session: _Session, error: smtplib.SMTPResponseException):
+        """A 4xx/5xx reply to one message leaves the session usable, except 421."""
+        if error.smtp_code == 421:
+            self._quit(session.server)
+        else:
+            try:
+                session.server.rset()
+                self._checkin(session)
+            except Exception:
+                self._quit(session.server)
+
+    def close(self):
+        """QUIT every idle session. Called from the lifespan shutdown."""
+        with self._lock:
+            sessions, self._idle = self._idle, []
+        for session in sessions:
+            self._quit(session.server)
+        if sessions:
+            logger.info(f"[Gmail] Closed {len(sessions)} pooled SMTP session(s).")
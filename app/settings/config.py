@@ -4,7 +4,7 @@ Single source of truth for all environment variables.
 
 Structure:
   Settings (BaseSettings) — the ONLY BaseSettings class
-    ├── Grouped access via @property (api, email, social, resend)
+    ├── Grouped access via @property (api, email, social, resend, storage)
     └── All fields flat — pydantic-settings reads them directly from .env
 
 Why flat:
@@ -30,6 +30,11 @@ class EmailProvider(StrEnum):
     GMAIL  = "gmail"
 
 
+class VisitorStoreBackend(StrEnum):
+    EXCEL  = "excel"
+    SQLITE = "sqlite"
+
+
 # ── Group models (plain BaseModel — NOT BaseSettings) ──────────────────────
 # These are just typed containers for grouped access.
 # They never read from .env themselves — Settings does that.
@@ -67,6 +72,14 @@ class ResendConfig(BaseModel):
     resend_sender:  str
 
 
+class StorageConfig(BaseModel):
+    visitor_store:    VisitorStoreBackend
+    visitor_log_path: str
+    visitor_db_path:  str
+    sheets_outbox_path: str
+    email_queue_path:   str
+
+
 # ── Root settings ──────────────────────────────────────────────────────────
 class Settings(BaseSettings):
     """
@@ -135,6 +148,16 @@ class Settings(BaseSettings):
         validation_alias="SHEET_NAME",
     )
 
+    # ── Outbound HTTP ──────────────────────────────────────────────────
+    http_pool_connections: int = Field(
+        default=4,
+        validation_alias="HTTP_POOL_CONNECTIONS",   # hosts with a cached keep-alive pool
+    )
+    http_pool_maxsize: int = Field(
+        default=8,
+        validation_alias="HTTP_POOL_MAXSIZE",   # idle connections kept per host
+    )
+
     # ── Email (shared) ─────────────────────────────────────────────────
     email_host: str = Field(
         default="smtp.gmail.com",
@@ -152,6 +175,14 @@ class Settings(BaseSettings):
         default=None,
         validation_alias="EMAIL_PASS",
     )
+    smtp_pool_size: int = Field(
+        default=2,
+        validation_alias="SMTP_POOL_SIZE",   # logged-in Gmail sessions kept for reuse
+    )
+    smtp_idle_timeout: float = Field(
+        default=120.0,
+        validation_alias="SMTP_IDLE_TIMEOUT",   # idle sessions older than this are reopened
+    )
 
     # ── Social ─────────────────────────────────────────────────────────
     autobound_api_key: Optional[str] = Field(
@@ -172,6 +203,42 @@ class Settings(BaseSettings):
         default="",
         validation_alias="RESEND_SENDER",
     )
+    resend_batch_window: float = Field(
+        default=1.0,
+        validation_alias="RESEND_BATCH_WINDOW",   # seconds to gather emails into one Batch.send
+    )
+
+    # ── Email queue ────────────────────────────────────────────────────
+    email_queue_path: str = Field(
+        default="/backend/logs/email-queue.db",
+        validation_alias="EMAIL_QUEUE_PATH",   # pending email jobs survive restarts
+    )
+    email_workers: int = Field(
+        default=2,
+        validation_alias="EMAIL_WORKERS",   # threads generating + sending emails
+    )
+    email_max_attempts: int = Field(
+        default=5,
+        validation_alias="EMAIL_MAX_ATTEMPTS",   # then the job is dead-lettered
+    )
+
+    # ── Visitor storage ────────────────────────────────────────────────
+    visitor_store: VisitorStoreBackend = Field(
+        default=VisitorStoreBackend.EXCEL,
+        validation_alias="VISITOR_STORE",
+    )
+    visitor_log_path: str = Field(
+        default="/backend/logs/visitors.xlsx",
+        validation_alias="VISITOR_LOG_PATH",
+    )
+    visitor_db_path: str = Field(
+        default="/backend/logs/visitors.db",
+        validation_alias="VISITOR_DB_PATH",
+    )
+    sheets_outbox_path: str = Field(
+        default="/backend/logs/sheets-outbox.journal",
+        validation_alias="SHEETS_OUTBOX_PATH",   # pending Sheets writes, replayed after restarts
+    )
 
     # ── Admin ──────────────────────────────────────────────────────────
     admin_username: str = Field(
@@ -186,6 +253,22 @@ class Settings(BaseSettings):
         default="change-this-in-production",
         validation_alias="JWT_SECRET",
     )
+    admin_cache_ttl: float = Field(
+        default=15.0,
+        validation_alias="ADMIN_CACHE_TTL",   # seconds between store/Sheets merges
+    )
+    sheets_read_timeout: float = Field(
+        default=3.0,
+        validation_alias="SHEETS_READ_TIMEOUT",   # admin view falls back to the store alone after this
+    )
+    sheets_sync_interval: float = Field(
+        default=10.0,
+        validation_alias="SHEETS_SYNC_INTERVAL",   # min seconds between mirror delta syncs
+    )
+    sheets_checksum_interval: float = Field(
+        default=300.0,
+        validation_alias="SHEETS_CHECKSUM_INTERVAL",   # full fetch + hash to catch manual edits
+    )
     # ── Email models ───────────────────────────────────────────────────────────
     model_e1: str = Field(default="", validation_alias="MODEL_E1")
     model_e2: str = Field(default="", validation_alias="MODEL_E2")
@@ -229,6 +312,16 @@ class Settings(BaseSettings):
             resend_sender=self.resend_sender,
         )
 
+    @property
+    def storage(self) -> StorageConfig:
+        return StorageConfig(
+            visitor_store=self.visitor_store,
+            visitor_log_path=self.visitor_log_path,
+            visitor_db_path=self.visitor_db_path,
+            sheets_outbox_path=self.sheets_outbox_path,
+            email_queue_path=self.email_queue_path,
+        )
+
 
 @lru_cache
 def get_settings() -> Settings:
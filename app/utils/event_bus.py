@@ -0,0 +1,79 @@
+"""
+event_bus.py
+In-process pub/sub for live admin updates (/admin/stream).
+
+  - subscribe() is called from a coroutine and returns an asyncio.Queue
+    bound to the running event loop.
+  - publish() is safe from any thread — the sync route handlers run in
+    Starlette's threadpool — and hands each event to the subscriber's
+    loop with call_soon_threadsafe.
+  - Queues are bounded; a subscriber that falls behind loses its oldest
+    events rather than growing without limit or slowing publishers.
+
+Events are (name, data) tuples:
+  visitor → the new visitor row as a dict (HEADERS keys)
+  stats   → counter deltas per committed batch, e.g. {"total": 2, "hr": 1, "skipped": 1, "today": 2}
+  contact → {"id", "email", "github", "linkedin", "timestamp"} of the updated
+            row (GitHub/LinkedIn as stored, i.e. full profile URLs)
+
+Per process only — with several uvicorn workers (the production image
+runs --workers 2) a stream sees only the events of the worker that serves
+it, roughly half of them. Known gap: the dashboard must keep polling
+/admin/visitors and /admin/stats as the source of truth and use the
+stream as a hint to refresh sooner. /admin/stream says so in its
+X-Stream-Scope response header.
+"""
+
+import asyncio
+import logging
+from functools import lru_cache
+from threading import Lock
+
+logger = logging.getLogger("portfolio.events")
+
+
+class EventBus:
+    def __init__(self, max_queue: int = 256):
+        self.max_queue    = max_queue
+        self._subscribers: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self._lock        = Lock()
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, item: tuple):
+        """Runs on the subscriber's loop — drop the oldest event if full."""
+        if queue.full():
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(item)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def publish(self, event: str, data: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, (event, data))
+            except RuntimeError:
+                self.unsubscribe(queue)   # loop closed under us
+        if subscribers:
+            logger.debug(f"Event '{event}' published to {len(subscribers)} subscriber(s).")
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+
+@lru_cache
+def get_event_bus() -> EventBus:
+    """Shared bus — log_router publishes, admin_router streams."""
+    return EventBus()
@@ -1,14 +1,70 @@
 """
 excel_manager.py
-Primary visitor log store — reads/writes a local .xlsx file on the shared host.
+Primary visitor log store — reads/writes local .xlsx files on the shared host.
 Falls back gracefully if openpyxl is unavailable.
+
+Partitions:
+  The log is split by month — visitors-2026-10.xlsx + visitors-2026-10.journal.
+  Writes only touch the partition for the row's month, and date-range
+  queries only open the partitions that overlap the range. A legacy,
+  unpartitioned visitors.xlsx is split into monthly files once on first
+  start and kept as visitors.xlsx.migrated.
+
+Write path:
+  append_visitor / update_contact only append a record to the partition's
+  journal — O(1) regardless of history size. A contact update restamps the
+  row, so one whose row sits in an older month moves it: the updated row
+  is appended to the current partition, then removed from the old one —
+  every row stays in the partition its Timestamp names. The styled workbook is
+  rebuilt from the journal by compaction, which runs once a journal passes
+  `compact_bytes` and again at shutdown.
+
+Read path:
+  workbook rows (streamed in openpyxl read-only mode) + journal replayed
+  on top, so readers always see
+  every write, compacted or not. Each partition keeps an in-memory,
+  read-only snapshot: its workbook is only re-parsed when its inode,
+  mtime or size changes, new journal bytes are replayed incrementally,
+  and this process's own appends are applied to the snapshot in place.
+  Hash indexes ID → row and Email → latest row are maintained alongside
+  each snapshot, and a store-wide index maps ID → month and Email →
+  newest month, so get_visitor and update_contact open one partition
+  (plus the two newest, where other workers' rows land) — a miss never
+  walks the whole history.
+  Callers must treat returned dicts as read-only; the store never mutates
+  them either — a contact update swaps in an updated copy (copy-on-write),
+  so a dict a caller already holds never changes under it.
+
+Stats:
+  Counters live in visitors.stats.json (see VisitorStats) and are bumped
+  on every append, so get_stats is O(1). Counters are not recounted
+  after seeding; delete the file (and restart) to force a recount if they
+  drift. A contact-update restamp does not count toward "today".
+
+Listeners:
+  add_listener(fn, ops) — fn(records) is called once an append and/or
+  contact update ("append", "update") is durable, with the affected
+  records (e.g. to keep the admin search index current, or to publish
+  live events). Called outside the locks; failures are logged, not raised.
+
+Concurrency:
+  One shared instance per process (see visitor_store.get_visitor_store);
+  threads are serialised by self._lock. Processes (uvicorn workers) are
+  coordinated by an flock on visitors.lock — exclusive for journal writes
+  and compaction, shared for reads — so a reader never sees the window
+  between a compaction's workbook replace and its journal truncate.
 """
 
 import os
+import re
 import logging
 from datetime import datetime
 from threading import Lock
 
+from app.utils.file_lock import FileLock
+from app.utils.visitor_journal import VisitorJournal
+from app.utils.visitor_stats import VisitorStats
+
 try:
     from openpyxl import Workbook, load_workbook
     from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
@@ -30,27 +86,247 @@ HEADER_FILL  = "1F2D3D"
 HEADER_FONT  = "FFFFFF"
 ALT_ROW_FILL = "F2F5F9"
 
+_MONTH_RE = re.compile(r"^\d{4}-\d{2}$")
+
+
+def _month_of(timestamp) -> str:
+    """Partition key for a Timestamp cell — current month if unparseable."""
+    month = str(timestamp or "")[:7]
+    return month if _MONTH_RE.match(month) else datetime.now().strftime("%Y-%m")
+
+
+def in_date_range(record: dict, since: str | None, until: str | None) -> bool:
+    """since/until are inclusive YYYY-MM-DD[ HH:MM:SS] prefixes."""
+    ts = str(record.get("Timestamp") or "")
+    if since and ts < since:
+        return False
+    if until and ts[: len(until)] > until:
+        return False
+    return True
+
+
+def log_exists(filepath: str) -> bool:
+    """True if there is any Excel visitor history (legacy file or partitions)."""
+    directory, name = os.path.split(filepath)
+    stem = os.path.splitext(name)[0]
+    if os.path.exists(filepath):
+        return True
+    try:
+        return any(
+            f.startswith(f"{stem}-") and f.endswith(".xlsx") for f in os.listdir(directory)
+        )
+    except OSError:
+        return False
+
+
+class _MonthIndex:
+    """Which partition holds an ID, and the newest one holding an Email — across all months."""
+
+    def __init__(self):
+        self.ids:    dict[str, str] = {}
+        self.emails: dict[str, str] = {}
+
+    def add(self, record: dict, month: str):
+        if record.get("ID"):
+            self.ids[str(record["ID"])] = month
+        email = record.get("Email")
+        if email and month >= self.emails.get(email, ""):
+            self.emails[email] = month
+
+    def drop(self, record: dict, month: str, email_left: bool):
+        """A record left `month`; `email_left` — the month still has rows for its Email."""
+        if self.ids.get(str(record.get("ID") or "")) == month:
+            del self.ids[str(record["ID"])]
+        email = record.get("Email")
+        if email and not email_left and self.emails.get(email) == month:
+            del self.emails[email]
+
+
+class _Partition:
+    """One month of the log — workbook, journal and in-memory snapshot."""
+
+    def __init__(self, month: str, filepath: str, journal_path: str, index: _MonthIndex | None = None):
+        self.month          = month
+        self.index          = index   # None for the legacy file during migration
+        self.filepath       = filepath
+        self.journal        = VisitorJournal(journal_path)
+        self.records: list[dict] | None = None
+        self.by_id:    dict[str, dict]   = {}
+        self.by_email: dict[str, dict]   = {}
+        self.wb_sig         = None
+        self.journal_offset = 0
+
+    def reset(self, wb_sig):
+        self.records        = []
+        self.by_id          = {}
+        self.by_email       = {}
+        self.wb_sig         = wb_sig
+        self.journal_offset = 0
+
+    def add(self, record: dict):
+        self.records.append(record)
+        if record.get("ID"):
+            self.by_id[str(record["ID"])] = record
+        if record.get("Email"):
+            self.by_email[record["Email"]] = record   # later rows win
+        if self.index is not None:
+            self.index.add(record, self.month)
+
+    def replace(self, old: dict, new: dict):
+        """Swap in an updated copy of a record — the old dict is left untouched."""
+        for i in range(len(self.records) - 1, -1, -1):   # updates hit recent rows
+            if self.records[i] is old:
+                self.records[i] = new
+                break
+        if self.by_id.get(str(old.get("ID") or "")) is old:
+            self.by_id[str(old["ID"])] = new
+        if self.by_email.get(old.get("Email")) is old:
+            self.by_email[old["Email"]] = new
+
+    def remove(self, record: dict):
+        """Drop a record. Builds a new list, so a reader walking the old one is unaffected."""
+        self.records = [r for r in self.records if r is not record]
+        if self.by_id.get(str(record.get("ID") or "")) is record:
+            del self.by_id[str(record["ID"])]
+        email = record.get("Email")
+        if email and self.by_email.get(email) is record:
+            latest = next((r for r in reversed(self.records) if r.get("Email") == email), None)
+            if latest is None:
+                del self.by_email[email]
+            else:
+                self.by_email[email] = latest
+        if self.index is not None:
+            self.index.drop(record, self.month, email in self.by_email)
+
 
 class ExcelManager:
-    def __init__(self, filepath: str):
-        self.filepath = filepath
-        self._lock    = Lock()
-        if OPENPYXL_OK:
-            self._ensure_file()
-        else:
+    def __init__(
+        self,
+        filepath: str,
+        compact_bytes: int = 1_048_576,
+        read_only: bool = False,
+    ):
+        self.filepath      = filepath   # legacy, unpartitioned file — also names the partitions
+        self.compact_bytes = compact_bytes
+        self._dir, name    = os.path.split(filepath)
+        self._stem         = os.path.splitext(name)[0]
+        self._part_re      = re.compile(rf"^{re.escape(self._stem)}-(\d{{4}}-\d{{2}})\.xlsx$")
+        self._partitions: dict[str, _Partition] = {}
+        self._index        = _MonthIndex()
+        self._indexed      = False
+        self._lock         = Lock()
+        self._file_lock    = FileLock(self._sidecar(".lock"))
+        self.stats         = VisitorStats(self._sidecar(".stats.json"))
+        self._listeners: list = []
+        if OPENPYXL_OK and not read_only:     # read_only: no migration, no stats seed, no writes
+            os.makedirs(self._dir, exist_ok=True)
+            self._migrate_legacy()
+            self._ensure_stats()
+        elif not OPENPYXL_OK:
             logger.warning("openpyxl not installed — Excel logging disabled.")
 
+    # ── Partitions ──────────────────────────────────────────────────────
+    def _sidecar(self, suffix: str) -> str:
+        return os.path.join(self._dir, self._stem + suffix)
+
+    def _partition(self, month: str) -> _Partition:
+        p = self._partitions.get(month)
+        if p is None:
+            p = _Partition(
+                month,
+                self._sidecar(f"-{month}.xlsx"),
+                self._sidecar(f"-{month}.journal"),
+                self._index,
+            )
+            self._partitions[month] = p
+        return p
+
+    def _months(self, since: str | None = None, until: str | None = None) -> list[str]:
+        """Months on disk (oldest first) that overlap [since, until]."""
+        try:
+            names = os.listdir(self._dir)
+        except OSError:
+            return []
+        months = sorted(m.group(1) for m in map(self._part_re.match, names) if m)
+        return [
+            m for m in months
+            if (not since or m >= since[:7]) and (not until or m <= until[:7])
+        ]
+
+    def _ensure_indexed(self):
+        """Load every partition once to fill the month index. Caller holds both locks."""
+        if self._indexed:
+            return
+        for month in self._months():
+            self._refresh(self._partition(month))
+        self._indexed = True
+
+    def _candidates(self, month: str | None) -> list[_Partition]:
+        """The indexed month plus the two newest — newest first. Caller holds both locks."""
+        months = set(self._months()[-2:])
+        if month:
+            months.add(month)
+        return [self._partition(m) for m in sorted(months, reverse=True)]
+
+    def _migrate_legacy(self):
+        """Split a pre-partitioning visitors.xlsx (+ journal) into monthly files."""
+        if not os.path.exists(self.filepath):
+            return
+        with self._lock, self._file_lock.exclusive():
+            if not os.path.exists(self.filepath):   # another worker got there first
+                return
+            try:
+                legacy  = _Partition("legacy", self.filepath, self._sidecar(".journal"))
+                by_month: dict[str, list[dict]] = {}
+                for record in self._refresh(legacy):
+                    by_month.setdefault(_month_of(record.get("Timestamp")), []).append(record)
+
+                for month, records in sorted(by_month.items()):
+                    p = self._partition(month)
+                    self._ensure_file(p)
+                    self._refresh(p)
+                    done = p.by_id   # skip rows a previous, interrupted run already moved
+                    ops  = [
+                        {"op": "append", "row": [r.get(h) for h in HEADERS]}
+                        for r in records if str(r.get("ID")) not in done
+                    ]
+                    self._journal_ops(p, ops)
+                    self._compact(p)
+
+                legacy.journal.close()
+                os.replace(self.filepath, self.filepath + ".migrated")
+                if os.path.exists(legacy.journal.path):
+                    os.remove(legacy.journal.path)
+                logger.info(f"Excel: split legacy log into {len(by_month)} monthly partition(s).")
+            except Exception as e:
+                logger.error(f"Excel legacy migration failed: {e}")
+
     # ── Internal helpers ────────────────────────────────────────────────
-    def _ensure_file(self):
-        if os.path.exists(self.filepath):
+    def _ensure_file(self, p: _Partition):
+        """Create the partition workbook. Caller must hold the exclusive file lock."""
+        if os.path.exists(p.filepath):
             return
-        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
         wb = Workbook()
         ws = wb.active
         ws.title = "Visitors"
         self._write_headers(ws)
-        wb.save(self.filepath)
-        logger.info(f"Excel log created at {self.filepath}")
+        wb.save(p.filepath)
+        logger.info(f"Excel log created at {p.filepath}")
+
+    def _ensure_stats(self):
+        """First run with counters — seed them from the existing log once."""
+        if self.stats.exists():
+            return
+        with self._lock, self._file_lock.exclusive():
+            if self.stats.exists():
+                return
+            try:
+                records = []
+                for month in self._months():
+                    records.extend(self._refresh(self._partition(month)))
+                self.stats.rebuild(records)
+            except Exception as e:
+                logger.error(f"Excel stats seed failed: {e}")
 
     def _write_headers(self, ws):
         fill   = PatternFill("solid", fgColor=HEADER_FILL)
@@ -70,9 +346,6 @@ class ExcelManager:
         for i, w in enumerate(col_widths, start=1):
             ws.column_dimensions[ws.cell(row=1, column=i).column_letter].width = w
 
-    def _load_wb(self):
-        return load_workbook(self.filepath)
-
     def _style_data_row(self, ws, row_idx: int):
         """Alternating row shading for readability."""
         if row_idx % 2 == 0:
@@ -80,50 +353,340 @@ class ExcelManager:
             for col in range(1, len(HEADERS) + 1):
                 ws.cell(row=row_idx, column=col).fill = fill
 
-    # ── Public API ──────────────────────────────────────────────────────
-    def append_visitor(self, row: list):
-        if not OPENPYXL_OK:
-            logger.warning("Excel append skipped (openpyxl missing).")
+    @staticmethod
+    def _file_sig(path: str):
+        try:
+            st = os.stat(path)
+            return (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _refresh(self, p: _Partition) -> list[dict]:
+        """
+        Bring a partition's snapshot up to date. Caller must hold self._lock
+        and at least a shared file lock.
+        Full workbook parse only when the .xlsx itself changed;
+        otherwise just replay journal bytes written since the last read.
+        """
+        wb_sig = self._file_sig(p.filepath)
+        if (
+            p.records is None
+            or wb_sig != p.wb_sig
+            or p.journal.size() < p.journal_offset
+        ):
+            p.reset(wb_sig)
+            if wb_sig is not None:
+                for record in self._iter_rows(p.filepath):
+                    p.add(record)
+
+        ops, p.journal_offset = p.journal.read_from(p.journal_offset)
+        self._replay(p, ops)
+        return p.records
+
+    def _journal_ops(self, p: _Partition, ops: list[dict]):
+        """
+        Append ops to a partition's journal. Caller must hold self._lock
+        and the exclusive file lock.
+        If the snapshot was current, apply the same ops to it in place
+        so the next read does not have to touch the disk.
+        """
+        if not ops:
             return
-        with self._lock:
-            try:
-                wb = self._load_wb()
-                ws = wb.active
+        was_current = (
+            p.records is not None
+            and p.journal.size() == p.journal_offset
+        )
+        p.journal.append(ops)
+        if was_current:
+            self._replay(p, ops)
+            p.journal_offset = p.journal.size()
+
+    @staticmethod
+    def _iter_rows(path: str):
+        """
+        Stream a workbook's rows as dicts using openpyxl's read-only mode —
+        no styles, no cell objects, no intermediate list of the whole sheet.
+        """
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            ws = wb.active
+            ws.reset_dimensions()   # don't trust stored dimensions; read to the real end
+            rows = ws.iter_rows(values_only=True)
+            first = next(rows, None)
+            if not first:
+                return
+            headers = [str(h) for h in first]
+            for row in rows:
+                if not any(cell is not None for cell in row):
+                    continue
+                yield {h: (row[i] if i < len(row) else None) for i, h in enumerate(headers)}
+        finally:
+            wb.close()
+
+    @staticmethod
+    def _contact_values(op: dict) -> dict:
+        """Column → new value for a journalled contact update."""
+        values = {"Timestamp": op.get("timestamp")}
+        if op.get("github"):
+            values["GitHub"] = f"https://github.com/{op['github']}"
+        if op.get("linkedin"):
+            values["LinkedIn"] = f"https://linkedin.com/in/{op['linkedin']}"
+        return values
+
+    @staticmethod
+    def _to_record(row: list) -> dict:
+        return {h: (row[i] if i < len(row) else None) for i, h in enumerate(HEADERS)}
+
+    def _replay(self, p: _Partition, ops: list[dict]):
+        """Apply journal ops, in order, on top of the partition snapshot."""
+        for op in ops:
+            if op.get("op") == "append":
+                p.add(self._to_record(op.get("row") or []))
+            elif op.get("op") == "update":
+                target = p.by_email.get(op.get("email"))
+                if target is not None:
+                    p.replace(target, {**target, **self._contact_values(op)})
+            elif op.get("op") == "remove":
+                target = p.by_id.get(str(op.get("id")))
+                if target is not None:
+                    p.remove(target)
+
+    def _compact(self, p: _Partition):
+        """Fold one partition's journal into its workbook. Caller holds both locks."""
+        ops, end_offset = p.journal.read_from(0)
+        if not ops:
+            return
+        wb = load_workbook(p.filepath)
+        ws = wb.active
+
+        header    = [str(c.value) for c in ws[1]]
+        email_col = header.index("Email") + 1
+        id_col    = header.index("ID") + 1
+        col_of    = {h: header.index(h) + 1 for h in HEADERS if h in header}
+        appended  = 0
+
+        # Email → latest row number; only needed if there are updates to apply
+        email_row: dict[str, int] = {}
+        if any(op.get("op") == "update" for op in ops):
+            for row_idx, (value,) in enumerate(
+                ws.iter_rows(min_row=2, min_col=email_col, max_col=email_col, values_only=True),
+                start=2,
+            ):
+                if value:
+                    email_row[value] = row_idx
+
+        # ID → row number; only needed if rows were moved out
+        id_row: dict[str, int] = {}
+        removed: list[int]     = []
+        if any(op.get("op") == "remove" for op in ops):
+            for row_idx, (value,) in enumerate(
+                ws.iter_rows(min_row=2, min_col=id_col, max_col=id_col, values_only=True),
+                start=2,
+            ):
+                if value:
+                    id_row[str(value)] = row_idx
+
+        for op in ops:
+            if op.get("op") == "append":
                 next_row = ws.max_row + 1
-                for col, value in enumerate(row, start=1):
+                for col, value in enumerate(op.get("row") or [], start=1):
                     cell = ws.cell(row=next_row, column=col, value=value)
                     cell.alignment = Alignment(wrap_text=True, vertical="top")
                 self._style_data_row(ws, next_row)
-                wb.save(self.filepath)
-                logger.info(f"Excel: row {next_row} written.")
+                row = op.get("row") or []
+                if len(row) > email_col - 1 and row[email_col - 1]:
+                    email_row[row[email_col - 1]] = next_row
+                if len(row) > id_col - 1 and row[id_col - 1]:
+                    id_row[str(row[id_col - 1])] = next_row
+                appended += 1
+            elif op.get("op") == "update":
+                row_idx = email_row.get(op.get("email"))
+                if row_idx:
+                    for key, value in self._contact_values(op).items():
+                        ws.cell(row=row_idx, column=col_of[key]).value = value
+            elif op.get("op") == "remove":
+                row_idx = id_row.pop(str(op.get("id")), None)
+                if row_idx:
+                    removed.append(row_idx)
+
+        # Delete bottom-up so earlier row numbers stay valid
+        for row_idx in sorted(removed, reverse=True):
+            ws.delete_rows(row_idx)
+
+        tmp_path = p.filepath + ".tmp"
+        wb.save(tmp_path)
+        os.replace(tmp_path, p.filepath)
+        p.journal.truncate()
+
+        # Same content, new location — keep the snapshot if it was current
+        if p.records is not None and p.journal_offset == end_offset:
+            p.wb_sig         = self._file_sig(p.filepath)
+            p.journal_offset = 0
+        else:
+            p.records = None
+        logger.info(
+            f"Excel: compacted {len(ops)} journal records into {p.month} "
+            f"({appended} new rows, {len(removed)} moved out)."
+        )
+
+    def _maybe_compact(self, months):
+        for month in months:
+            p = self._partition(month)
+            if p.journal.size() >= self.compact_bytes:
+                self.compact(month)
+
+    def _notify(self, records: list[dict], op: str):
+        for listener, ops in self._listeners:
+            if op not in ops:
+                continue
+            try:
+                listener(records)
             except Exception as e:
-                logger.error(f"Excel append failed: {e}")
+                logger.warning(f"Excel listener failed: {e}")
 
-    def get_all_visitors(self) -> list[dict]:
-        """Return all rows as list of dicts (for admin panel)."""
+    # ── Public API ──────────────────────────────────────────────────────
+    def add_listener(self, listener, ops: tuple[str, ...] = ("append", "update")):
+        """Call listener(records) after every committed append and/or contact update."""
+        self._listeners.append((listener, ops))
+
+    def append_visitor(self, row: list):
+        self.append_visitors([row])
+
+    def append_visitors(self, rows: list[list]):
+        """
+        Group commit — each month's rows land in one journal write and one fsync.
+        Used by VisitorWriter to commit a whole batch at once.
+        """
+        if not OPENPYXL_OK:
+            logger.warning("Excel append skipped (openpyxl missing).")
+            return
+        if not rows:
+            return
+        ts_idx   = HEADERS.index("Timestamp")
+        by_month: dict[str, list[list]] = {}
+        for row in rows:
+            by_month.setdefault(_month_of(row[ts_idx] if len(row) > ts_idx else None), []).append(row)
+        records = [self._to_record(row) for row in rows]
+        try:
+            with self._lock, self._file_lock.exclusive():
+                for month, month_rows in by_month.items():
+                    p = self._partition(month)
+                    self._ensure_file(p)
+                    self._journal_ops(p, [{"op": "append", "row": row} for row in month_rows])
+                    p.journal.sync()
+                try:
+                    self.stats.record(records)
+                except Exception as e:
+                    logger.warning(f"Excel stats update failed: {e}")
+        except Exception as e:
+            logger.error(f"Excel append failed: {e}")
+            return
+        self._notify(records, "append")
+        self._maybe_compact(by_month)
+
+    def compact(self, month: str | None = None):
+        """
+        Fold journals into their styled workbooks, then truncate them.
+        Cost is O(partition) but paid once per `compact_bytes` of journal,
+        not once per visitor. No month → every partition with pending records.
+        """
         if not OPENPYXL_OK:
+            return
+        with self._lock, self._file_lock.exclusive():
+            for m in ([month] if month else self._months()):
+                try:
+                    self._compact(self._partition(m))
+                except Exception as e:
+                    logger.error(f"Excel compaction of {m} failed: {e}")
+
+    def close(self):
+        """Flush and compact every journal — called at shutdown."""
+        for p in list(self._partitions.values()):
+            p.journal.sync()
+        self.compact()
+        for p in list(self._partitions.values()):
+            p.journal.close()
+
+    @classmethod
+    def read_log(cls, filepath: str) -> list[dict]:
+        """
+        Every record of an Excel log — a legacy visitors.xlsx and the monthly
+        partitions, journals replayed — deduplicated by ID (partitions win).
+        Reads only: the legacy file is not migrated, stats are not seeded and
+        nothing is written, so another backend can import the history and
+        leave the Excel log exactly as it was.
+        """
+        if not OPENPYXL_OK or not log_exists(filepath):
             return []
-        with self._lock:
+        manager = cls(filepath, read_only=True)
+        parts   = [_Partition("legacy", filepath, manager._sidecar(".journal"))] if os.path.exists(filepath) else []
+        parts  += [manager._partition(month) for month in manager._months()]
+        by_id: dict[str, dict] = {}
+        with manager._lock, manager._file_lock.shared():
+            for p in parts:
+                for record in manager._refresh(p):
+                    by_id[str(record.get("ID") or id(record))] = record
+        return list(by_id.values())
+
+    def get_all_visitors(self, since: str | None = None, until: str | None = None) -> list[dict]:
+        """
+        Return rows as list of dicts, oldest first (for admin panel).
+        since/until (inclusive, YYYY-MM-DD) limit which partitions are opened.
+        The locks are taken per partition, so writers get in between months.
+        """
+        return list(self.iter_visitors(since, until))
+
+    def iter_visitors(
+        self,
+        since: str | None = None,
+        until: str | None = None,
+        newest_first: bool = False,
+    ):
+        """
+        Lazily yield records partition by partition — a consumer that stops
+        early never loads the older (or newer) partitions. The lock is only
+        held while a partition is refreshed, never across a yield.
+        Rows are read off the snapshot list up to its length at refresh time
+        (appends only extend it; a rebuild or row move swaps in a new list),
+        so nothing is copied.
+        """
+        if not OPENPYXL_OK:
+            return
+        with self._lock, self._file_lock.shared():
+            months = self._months(since, until)
+        for month in (reversed(months) if newest_first else months):
+            with self._lock, self._file_lock.shared():
+                try:
+                    part = self._refresh(self._partition(month))
+                except Exception as e:
+                    logger.error(f"Excel read of {month} failed: {e}")
+                    continue
+                n = len(part)
+            for i in (range(n - 1, -1, -1) if newest_first else range(n)):
+                record = part[i]
+                if (since or until) and not in_date_range(record, since, until):
+                    continue
+                yield record
+
+    def get_visitor(self, visitor_id: str) -> dict | None:
+        """Lookup by ID — only the partition the month index names (and the newest two) are opened."""
+        if not OPENPYXL_OK:
+            return None
+        with self._lock, self._file_lock.shared():
             try:
-                wb = self._load_wb()
-                ws = wb.active
-                rows = list(ws.iter_rows(values_only=True))
-                if not rows:
-                    return []
-                headers = [str(h) for h in rows[0]]
-                return [
-                    {headers[i]: row[i] for i in range(len(headers))}
-                    for row in rows[1:]
-                    if any(cell is not None for cell in row)
-                ]
+                self._ensure_indexed()
+                for p in self._candidates(self._index.ids.get(visitor_id)):
+                    self._refresh(p)
+                    if visitor_id in p.by_id:
+                        return p.by_id[visitor_id]
+                return None
             except Exception as e:
                 logger.error(f"Excel read failed: {e}")
-                return []
+                return None
 
     def get_latest_email(self) -> tuple[str | None, str | None]:
-        """Return (email, name) of the most recent valid visitor."""
-        records = self.get_all_visitors()
-        for row in reversed(records):
+        """Return (email, name) of the most recent valid visitor — scans from the end."""
+        for row in self.iter_visitors(newest_first=True):
             email = row.get("Email", "") or ""
             name  = row.get("Name",  "") or ""
             if email and "@" in email and not email.lower().startswith("string"):
@@ -131,45 +694,54 @@ class ExcelManager:
         return None, None
 
     def update_contact(self, email: str, github: str, linkedin: str):
-        """Update GitHub/LinkedIn for a visitor identified by email."""
+        """Update GitHub/LinkedIn on the latest row for this email."""
         if not OPENPYXL_OK:
             return
-        with self._lock:
-            try:
-                wb   = self._load_wb()
-                ws   = wb.active
-                rows = list(ws.iter_rows(values_only=True))
-                if not rows:
-                    return
-                header = [str(h) for h in rows[0]]
-                email_col   = header.index("Email")   + 1
-                github_col  = header.index("GitHub")  + 1
-                linkedin_col = header.index("LinkedIn") + 1
-                ts_col      = header.index("Timestamp") + 1
-
-                for row_idx, row in enumerate(rows[1:], start=2):
-                    if row[email_col - 1] == email:
-                        if github:
-                            ws.cell(row=row_idx, column=github_col).value  = f"https://github.com/{github}"
-                        if linkedin:
-                            ws.cell(row=row_idx, column=linkedin_col).value = f"https://linkedin.com/in/{linkedin}"
-                        ws.cell(row=row_idx, column=ts_col).value = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            with self._lock, self._file_lock.exclusive():
+                # Journal into the partition that holds the row — almost always the current month
+                self._ensure_indexed()
+                owner = None
+                for p in self._candidates(self._index.emails.get(email)):
+                    self._refresh(p)
+                    if email in p.by_email:
+                        owner = p
                         break
-                wb.save(self.filepath)
-                logger.info(f"Excel: contact updated for {email}")
-            except Exception as e:
-                logger.error(f"Excel update_contact failed: {e}")
+                if owner is None:
+                    logger.info(f"Excel: no visitor row for {email} — contact update skipped")
+                    return
+                op = {
+                    "op":        "update",
+                    "email":     email,
+                    "github":    github,
+                    "linkedin":  linkedin,
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                }
+                dest   = self._partition(_month_of(op["timestamp"]))
+                target = owner.by_email[email]
+                if dest is owner or not target.get("ID"):
+                    dest = owner
+                    self._journal_ops(owner, [op])
+                else:
+                    # Restamped into a new month — move the row so it stays in its partition
+                    moved = {**target, **self._contact_values(op)}
+                    self._ensure_file(dest)
+                    self._journal_ops(dest, [{"op": "append", "row": [moved.get(h) for h in HEADERS]}])
+                    dest.journal.sync()          # durable in its new home before it leaves the old one
+                    self._journal_ops(owner, [{"op": "remove", "id": target.get("ID")}])
+                self._refresh(dest)
+                updated = dest.by_email.get(email)
+            logger.info(f"Excel: contact update journalled for {email}")
+        except Exception as e:
+            logger.error(f"Excel update_contact failed: {e}")
+            return
+        if updated:
+            self._notify([updated], "update")
+        self._maybe_compact({owner.month, dest.month})
 
     def get_stats(self) -> dict:
-        """Quick stats for the admin dashboard."""
-        records = self.get_all_visitors()
-        if not records:
-            return {"total": 0, "hr": 0, "developer": 0, "visitor": 0, "today": 0}
-        today = datetime.now().strftime("%Y-%m-%d")
-        return {
-            "total":     len(records),
-            "hr":        sum(1 for r in records if r.get("UserType") == "hr"),
-            "developer": sum(1 for r in records if r.get("UserType") == "developer"),
-            "visitor":   sum(1 for r in records if r.get("UserType") == "visitor"),
-            "today":     sum(1 for r in records if str(r.get("Timestamp", "")).startswith(today)),
-        }
\ No newline at end of file
+        """Quick stats for the admin dashboard — read from the persisted counters."""
+        if not OPENPYXL_OK:
+            return {"total": 0, "hr": 0, "developer": 0, "visitor": 0, "skipped": 0, "today": 0}
+        with self._lock, self._file_lock.shared():
+            return self.stats.snapshot()
@@ -0,0 +1,82 @@
+"""
+file_lock.py
+Advisory inter-process lock on a sidecar file (fcntl.flock).
+
+Coordinates processes only — e.g. the uvicorn workers sharing
+/backend/logs. Threads inside one process still need their own Lock;
+each acquisition opens a fresh descriptor, so it is also safe to nest
+inside one.
+
+Falls back to a no-op where fcntl is unavailable (Windows dev boxes),
+which is fine for a single-process dev server.
+
+Usage:
+    lock = FileLock("/backend/logs/visitors.lock")
+    with lock.exclusive():   # writers, compaction
+        ...
+    with lock.shared():      # readers
+        ...
+    with lock.try_exclusive() as held:   # single background worker across processes
+        if held:
+            ...
+"""
+
+import logging
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+    FCNTL_OK = True
+except ImportError:
+    FCNTL_OK = False
+
+logger = logging.getLogger("portfolio.filelock")
+
+
+class FileLock:
+    def __init__(self, path: str):
+        self.path = path
+        if not FCNTL_OK:
+            logger.warning("fcntl unavailable — cross-process file locking disabled.")
+
+    @contextmanager
+    def _hold(self, mode: int):
+        if not FCNTL_OK:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, mode)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    @contextmanager
+    def try_exclusive(self):
+        """Non-blocking exclusive lock — yields False (holding nothing) if another process has it."""
+        if not FCNTL_OK:
+            yield True
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def exclusive(self):
+        return self._hold(fcntl.LOCK_EX if FCNTL_OK else 0)
+
+    def shared(self):
+        return self._hold(fcntl.LOCK_SH if FCNTL_OK else 0)
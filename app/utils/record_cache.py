@@ -0,0 +1,331 @@
+"""
+record_cache.py
+TTL cache of visitor-store + Google Sheets records for the admin panel.
+
+  - Refreshes at most once per `ttl` seconds — between refreshes admin
+    requests never touch the store or the Sheets API.
+  - The store and Sheets are fetched concurrently. Sheets gets
+    `sheets_timeout` seconds; past that the merge goes ahead with the
+    store alone and `partial` is set. The late Sheets fetch keeps running
+    and is folded in by whichever request comes after it lands — a slow
+    Sheets API never blocks the dashboard, and never piles up more than
+    one outstanding fetch. A fetch still running after `sheets_stale_after`
+    seconds (default 4 × ttl) is presumed hung: it is abandoned on its
+    daemon thread and a fresh one started at the next refresh.
+  - Waits happen outside the data lock. One request refreshes while the
+    others keep reading the previous data (only the very first load is
+    waited for), so a slow store or Sheets call never stalls readers.
+  - The store is read incrementally: fetch_store(since) is asked only for
+    rows stamped at or after the high-water mark (the newest Timestamp
+    seen, capped at now) minus `store_overlap` seconds, which covers writer
+    lag and the other workers' commits. Contact updates restamp their row,
+    so they come back through the same cursor. Only the first refresh
+    reads the whole store; `full_refresh` (seconds, off by default) or
+    invalidate(full=True) opt into more.
+  - A refresh merges only what changed: records with an unseen ID, or
+    whose contents differ from the cached copy, are sorted on their own
+    and merged into the already-sorted list in one linear pass — no full
+    sort.
+  - Store records win over Sheets records with the same ID.
+  - `on_change` (optional) receives each batch of new/changed records
+    after a merge — the admin search index is kept current this way.
+  - Kept in ascending (Timestamp, ID) order; get() returns newest first
+    and uses bisect for since/until ranges.
+  - scan() walks newest first from a (Timestamp, ID) keyset position with
+    filters applied on the way, so a page of results costs O(log n + page)
+    however deep it is.
+
+Records are shared, read-only dicts — copy before modifying.
+"""
+
+import heapq
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from threading import Event, Lock, Thread
+from typing import Callable
+
+logger = logging.getLogger("portfolio.cache")
+
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _key(record: dict) -> tuple[str, str]:
+    return (str(record.get("Timestamp") or ""), str(record.get("ID") or ""))
+
+
+def _spawn(fn: Callable[[], list[dict]], name: str) -> Future:
+    """Run fn on its own daemon thread — a hung call can be abandoned without starving a pool."""
+    future: Future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    Thread(target=run, name=name, daemon=True).start()
+    return future
+
+
+class MergedRecordCache:
+    def __init__(
+        self,
+        fetch_store:  Callable[[str], list[dict]],
+        fetch_sheets: Callable[[], list[dict]],
+        ttl: float = 15.0,
+        on_change: Callable[[list[dict]], None] | None = None,
+        sheets_timeout: float = 3.0,
+        sheets_stale_after: float | None = None,
+        store_overlap: float = 300.0,
+        full_refresh: float | None = None,
+    ):
+        self.fetch_store    = fetch_store
+        self.fetch_sheets   = fetch_sheets
+        self.ttl            = ttl
+        self.on_change      = on_change
+        self.sheets_timeout = sheets_timeout
+        self.sheets_stale_after = sheets_stale_after if sheets_stale_after is not None else 4 * ttl
+        self.store_overlap  = store_overlap
+        self.full_refresh   = full_refresh
+        self.partial        = False   # last refresh went ahead without Sheets
+        self._sheets_future: Future | None = None
+        self._sheets_started = 0.0
+        self._records: list[dict]            = []   # ascending by _key
+        self._keys:    list[tuple[str, str]] = []   # parallel to _records, for bisect
+        self._by_id:   dict[str, dict]       = {}
+        self._sorted_key: dict[str, tuple[str, str]] = {}
+        self._from_store: set[str]           = set()
+        self._refreshed_at = 0.0
+        self._full_at      = 0.0       # last full store read (monotonic)
+        self._full_due     = False     # invalidate(full=True)
+        self._store_mark   = ""        # newest store Timestamp merged so far
+        self._lock         = Lock()    # guards the merged data; never held while waiting
+        self._refresh_lock = Lock()    # one refresh at a time
+        self._loaded       = Event()   # first refresh finished
+
+    # ── Internal helpers ────────────────────────────────────────────────
+    def _merge(self, incoming: list[tuple[dict, bool]]):
+        """Fold (record, is_store) pairs into the sorted list. Caller holds self._lock."""
+        changed: dict[str, dict] = {}
+        for record, is_store in incoming:
+            record_id = str(record.get("ID") or "")
+            if not record_id:
+                continue
+            if not is_store and record_id in self._from_store:
+                continue                                  # store copy wins
+            promoted = is_store and record_id not in self._from_store
+            previous = self._by_id.get(record_id)
+            if not promoted and previous is not None and (previous is record or previous == record):
+                continue                                  # unchanged
+            changed[record_id] = record
+            if is_store:
+                self._from_store.add(record_id)
+
+        if not changed:
+            return
+
+        # Drop stale positions of changed IDs, then merge the new ones in
+        if any(rid in self._sorted_key for rid in changed):
+            kept = [r for r in self._records if str(r.get("ID")) not in changed]
+        else:
+            kept = self._records
+        fresh = sorted(changed.values(), key=_key)
+
+        self._by_id.update(changed)
+        self._sorted_key.update((rid, _key(r)) for rid, r in changed.items())
+        self._records = list(heapq.merge(kept, fresh, key=self._position))
+        self._keys    = [self._position(r) for r in self._records]
+        logger.info(f"Admin cache: merged {len(fresh)} new/changed record(s).")
+        if self.on_change is not None:
+            try:
+                self.on_change(fresh)
+            except Exception as e:
+                logger.warning(f"Admin cache on_change hook failed: {e}")
+
+    def _position(self, record: dict) -> tuple[str, str]:
+        """Key a record is sorted under — fixed at merge time, even if mutated later."""
+        return self._sorted_key.get(str(record.get("ID") or "")) or _key(record)
+
+    def _collect_sheets(self, future: Future, timeout: float) -> list[dict] | None:
+        """
+        Result of a Sheets fetch, waiting at most `timeout` (no lock held).
+        None → still running (left in place for a later request to collect).
+        """
+        try:
+            records = future.result(timeout=max(timeout, 0))
+        except FutureTimeout:
+            return None
+        except Exception as e:
+            logger.warning(f"Admin cache: Sheets fetch failed: {e}")
+            records = []
+        with self._lock:
+            if self._sheets_future is future:
+                self._sheets_future = None
+        return records
+
+    def _sheets_fetch(self) -> Future:
+        """The outstanding Sheets fetch, or a new one if there is none or it looks hung."""
+        with self._lock:
+            future = self._sheets_future
+            if future is not None and not future.done():
+                age = time.monotonic() - self._sheets_started
+                if age < self.sheets_stale_after:
+                    return future
+                future.cancel()
+                logger.warning(f"Admin cache: Sheets fetch hung for {age:.0f}s — abandoning it and starting over.")
+            elif future is not None:
+                return future                             # landed, not yet collected
+            self._sheets_future  = _spawn(self.fetch_sheets, "admin-fetch-sheets")
+            self._sheets_started = time.monotonic()
+            return self._sheets_future
+
+    def _collect_late(self):
+        """Fold in a Sheets fetch that missed its deadline, if it has landed since."""
+        future = self._sheets_future
+        if not self.partial or future is None or not future.done():
+            return
+        late = self._collect_sheets(future, 0)
+        if late is not None:
+            with self._lock:
+                self._merge([(r, False) for r in late])
+                self.partial = False
+
+    def _store_since(self, full: bool) -> str:
+        """Cursor for the next store read — "" for a full read."""
+        if full or not self._store_mark:
+            return ""
+        try:
+            mark = datetime.strptime(self._store_mark[:19], _TS_FORMAT)
+        except ValueError:
+            return ""
+        return (mark - timedelta(seconds=self.store_overlap)).strftime(_TS_FORMAT)
+
+    def _advance_mark(self, records: list[dict]):
+        """Move the high-water mark; a future-dated row can't push it past now. Caller holds self._lock."""
+        newest = max((str(r.get("Timestamp") or "") for r in records), default="")
+        newest = min(newest, datetime.now().strftime(_TS_FORMAT))
+        if newest > self._store_mark:
+            self._store_mark = newest
+
+    def _refresh(self):
+        """Fetch and merge. Caller holds self._refresh_lock, not self._lock."""
+        started        = time.monotonic()
+        full           = self._full_due or (
+            self.full_refresh is not None and started - self._full_at >= self.full_refresh
+        )
+        sheets_future  = self._sheets_fetch()    # runs alongside the store read
+        store_records  = self.fetch_store(self._store_since(full))
+        sheets_records = self._collect_sheets(sheets_future, self.sheets_timeout - (time.monotonic() - started))
+        if sheets_records is None:
+            logger.warning(
+                f"Admin cache: Sheets missed its {self.sheets_timeout:.1f}s deadline — serving store data only."
+            )
+        with self._lock:
+            self.partial = sheets_records is None
+            self._merge(
+                [(r, True) for r in store_records] + [(r, False) for r in sheets_records or []]
+            )
+            self._advance_mark(store_records)
+            if full:
+                self._full_at  = started
+                self._full_due = False
+            self._refreshed_at = time.monotonic()
+
+    def _refresh_if_stale(self):
+        """
+        Refresh if the TTL has passed. Called without self._lock. If another
+        request is already refreshing, serve the current data instead of
+        queueing behind it — except before the first load completes.
+        """
+        if time.monotonic() - self._refreshed_at < self.ttl:
+            self._collect_late()
+            return
+        if not self._refresh_lock.acquire(blocking=not self._loaded.is_set()):
+            return
+        try:
+            if time.monotonic() - self._refreshed_at >= self.ttl:
+                self._refresh()
+        except Exception as e:
+            logger.error(f"Admin cache refresh failed — serving previous data: {e}")
+        finally:
+            self._loaded.set()
+            self._refresh_lock.release()
+
+    # ── Public API ──────────────────────────────────────────────────────
+    def refresh(self):
+        """Refresh now if the TTL has passed — a no-op otherwise."""
+        self._refresh_if_stale()
+
+    def get(self, since: str = "", until: str = "") -> list[dict]:
+        """Merged records, newest first, optionally limited to [since, until]."""
+        self._refresh_if_stale()
+        with self._lock:
+            lo = bisect_left(self._keys, (since, "")) if since else 0
+            hi = bisect_right(self._keys, (until + "\uffff", "")) if until else len(self._keys)
+            if hi <= lo:
+                return []
+            return self._records[hi - 1 : lo - 1 if lo else None : -1]   # one reversed copy
+
+    def _view(self, before: tuple[str, str] | None, since: str, until: str):
+        """(records, lo, hi) for the slice a scan may visit. Lists are replaced, never mutated."""
+        self._refresh_if_stale()
+        with self._lock:
+            records, keys = self._records, self._keys
+        lo = bisect_left(keys, (since, "")) if since else 0
+        hi = bisect_right(keys, (until + "\uffff", "")) if until else len(keys)
+        if before is not None:
+            hi = min(hi, bisect_left(keys, before))
+        return records, lo, hi
+
+    def scan(
+        self,
+        before: tuple[str, str] | None = None,
+        since: str = "",
+        until: str = "",
+        match: Callable[[dict], bool] | None = None,
+    ):
+        """Yield records newest first, strictly older than `before`, that pass `match`."""
+        records, lo, hi = self._view(before, since, until)
+        for i in range(hi - 1, lo - 1, -1):
+            if match is None or match(records[i]):
+                yield records[i]
+
+    def count(
+        self,
+        since: str = "",
+        until: str = "",
+        match: Callable[[dict], bool] | None = None,
+    ) -> int:
+        """O(log n) without a filter; a scan of the range otherwise."""
+        if match is None:
+            _, lo, hi = self._view(None, since, until)
+            return hi - lo
+        return sum(1 for _ in self.scan(since=since, until=until, match=match))
+
+    def position(self, record: dict) -> tuple[str, str]:
+        """Keyset position of a record — what a cursor encodes."""
+        with self._lock:
+            return self._position(record)
+
+    def get_by_id(self, record_id: str) -> dict | None:
+        self._refresh_if_stale()
+        with self._lock:
+            return self._by_id.get(record_id)
+
+    def invalidate(self, full: bool = False):
+        """Force the next call to refresh (keeps the merged data); `full` re-reads the whole store."""
+        if full:
+            self._full_due = True
+        self._refreshed_at = 0.0
+
+    def close(self):
+        """Drop the outstanding Sheets fetch (its daemon thread dies with the process)."""
+        with self._lock:
+            future, self._sheets_future = self._sheets_future, None
+        if future is not None:
+            future.cancel()
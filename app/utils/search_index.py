@@ -0,0 +1,143 @@
+"""
+search_index.py
+In-process inverted index over visitor records for /admin/visitors?q=.
+
+  - Indexed fields (weight): Name, Email, Company (3) · Role, Subject (2)
+    · Answers, Body (1). Tokens are lowercase runs of letters/digits.
+  - Postings: term → {ID: weighted term frequency}. Each record's own
+    term weights are kept too, so re-indexing a record (contact update,
+    Sheets copy replaced by the store copy) removes exactly its old
+    postings — updates are O(record), never O(index).
+  - Prefix matching: terms are also kept in a sorted list, so every term
+    starting with "micro" is one bisect plus a short walk.
+  - Ranking: every query token must match (AND). Score is the sum of
+    weight × idf over matched terms, exact terms counting double a prefix
+    match. Ties go to the newest record.
+
+Fed from two sides (see admin_router): the visitor store's listeners on
+append/update, for immediacy, and the admin cache's merges, which also
+bring in Sheets-only records and writes made by other workers.
+
+Returned records are the shared, read-only dicts — copy before modifying.
+"""
+
+import logging
+import math
+import re
+from bisect import bisect_left, insort
+from threading import Lock
+
+logger = logging.getLogger("portfolio.search")
+
+FIELD_WEIGHTS = {
+    "Name":    3.0,
+    "Email":   3.0,
+    "Company": 3.0,
+    "Role":    2.0,
+    "Subject": 2.0,
+    "Answers": 1.0,
+    "Body":    1.0,
+}
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text) -> list[str]:
+    return _TOKEN_RE.findall(str(text or "").lower())
+
+
+class SearchIndex:
+    def __init__(self):
+        self._postings: dict[str, dict[str, float]] = {}
+        self._terms:    list[str]                   = []   # sorted, for prefix bisect
+        self._doc_terms: dict[str, dict[str, float]] = {}
+        self._docs:     dict[str, dict]             = {}
+        self._lock      = Lock()
+
+    # ── Internal helpers ────────────────────────────────────────────────
+    @staticmethod
+    def _weights(record: dict) -> dict[str, float]:
+        weights: dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(record.get(field)):
+                weights[term] = weights.get(term, 0.0) + weight
+        return weights
+
+    def _remove(self, record_id: str):
+        """Drop a record's postings. Caller holds self._lock."""
+        for term in self._doc_terms.pop(record_id, {}):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(record_id, None)
+            if not posting:
+                del self._postings[term]
+                i = bisect_left(self._terms, term)
+                if i < len(self._terms) and self._terms[i] == term:
+                    del self._terms[i]
+        self._docs.pop(record_id, None)
+
+    def _expand(self, token: str) -> list[str]:
+        """Indexed terms starting with token. Caller holds self._lock."""
+        i = bisect_left(self._terms, token)
+        terms = []
+        while i < len(self._terms) and self._terms[i].startswith(token):
+            terms.append(self._terms[i])
+            i += 1
+        return terms
+
+    # ── Public API ──────────────────────────────────────────────────────
+    def add(self, records: list[dict]):
+        """Index records, replacing any earlier version with the same ID."""
+        with self._lock:
+            for record in records:
+                record_id = str(record.get("ID") or "")
+                if not record_id:
+                    continue
+                self._remove(record_id)
+                weights = self._weights(record)
+                for term, weight in weights.items():
+                    posting = self._postings.get(term)
+                    if posting is None:
+                        posting = self._postings[term] = {}
+                        insort(self._terms, term)
+                    posting[record_id] = weight
+                self._doc_terms[record_id] = weights
+                self._docs[record_id]      = record
+
+    def remove(self, record_id: str):
+        with self._lock:
+            self._remove(record_id)
+
+    def search(self, query: str) -> list[dict]:
+        """Records matching every token of `query` (as a prefix), best first."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        with self._lock:
+            n_docs = len(self._docs) or 1
+            scores: dict[str, float] | None = None
+            for token in tokens:
+                token_scores: dict[str, float] = {}
+                for term in self._expand(token):
+                    posting = self._postings[term]
+                    idf     = math.log(1 + n_docs / len(posting))
+                    boost   = 2.0 if term == token else 1.0
+                    for record_id, weight in posting.items():
+                        token_scores[record_id] = token_scores.get(record_id, 0.0) + weight * idf * boost
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {rid: s + token_scores[rid] for rid, s in scores.items() if rid in token_scores}
+                if not scores:
+                    return []
+            docs = self._docs
+            ranked = sorted(
+                scores,
+                key=lambda rid: (scores[rid], str(docs[rid].get("Timestamp") or "")),
+                reverse=True,
+            )
+            return [docs[rid] for rid in ranked]
+
+    def __len__(self) -> int:
+        return len(self._docs)
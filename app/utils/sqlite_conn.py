@@ -0,0 +1,63 @@
+"""
+sqlite_conn.py
+Per-thread SQLite connections for the WAL-backed stores (visitor store,
+email queue).
+
+  - sqlite3 connections must not be used by two threads at once, so each
+    thread gets its own, opened with the same settings: WAL journal,
+    synchronous=NORMAL, a 10 s busy timeout and sqlite3.Row rows.
+  - Every connection is tracked, so close() (shutdown) closes all of
+    them — including the ones request threads opened — not just the
+    calling thread's. A thread that runs after a close() gets a fresh one.
+
+Usage:
+    conns = ThreadConnections(path)
+    with conns.get() as conn:
+        conn.execute(...)
+    conns.close()            # lifespan shutdown
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger("portfolio.sqlite")
+
+
+class ThreadConnections:
+    def __init__(self, db_path: str):
+        self.db_path     = db_path
+        self._local      = threading.local()
+        self._conns: set[sqlite3.Connection] = set()
+        self._lock       = threading.Lock()
+        self._generation = 0          # bumped by close(); stale thread-locals reopen
+
+    def get(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.generation != self._generation:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            # check_same_thread=False only so close() may close it from the shutdown thread
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            with self._lock:
+                self._conns.add(conn)
+                self._local.conn       = conn
+                self._local.generation = self._generation
+        return conn
+
+    def close(self) -> int:
+        """Close every thread's connection. Returns how many were open."""
+        with self._lock:
+            conns, self._conns = self._conns, set()
+            self._generation += 1
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.warning(f"SQLite close failed ({self.db_path}): {e}")
+        return len(conns)
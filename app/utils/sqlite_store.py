@@ -0,0 +1,266 @@
+"""
+sqlite_store.py
+SQLite visitor log store — drop-in alternative to ExcelManager.
+
+Selected with VISITOR_STORE=sqlite. Same public methods as ExcelManager
+(append_visitor, append_visitors, get_all_visitors, get_visitor,
+get_latest_email, update_contact, get_stats, close), so routers don't
+care which is active.
+
+  - WAL journal mode: readers never block the writer, and both uvicorn
+    workers can use the same database file safely.
+  - Indexed on ID (primary key), Email, UserType and Timestamp, so
+    lookups, filters and counts are O(log n) instead of a sheet scan.
+  - Connections come from ThreadConnections (sqlite_conn.py): one per
+    thread, all closed by close() at shutdown.
+  - add_listener(fn, ops) — fn(records) runs after each committed append
+    and/or contact update, as on ExcelManager.
+  - Stats are counters in visitor_counts, bumped by an insert trigger in
+    the same transaction as the row ('total', 'type:<UserType>',
+    'day:<YYYY-MM-DD>'), so get_stats reads a handful of rows by key.
+    Only inserts count: a contact update that restamps a row does not
+    move it into today's bucket.
+
+The styled .xlsx is no longer written on this backend; /admin/export
+builds it on demand. The Timestamp index plays the role of the Excel
+backend's monthly partitions — date-range reads are index range scans.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+
+from app.utils.excel_manager import HEADERS
+from app.utils.sqlite_conn import ThreadConnections
+
+logger = logging.getLogger("portfolio.sqlite")
+
+_COLUMNS = ", ".join(f'"{h}"' for h in HEADERS)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS visitors (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    {", ".join(f'"{h}" TEXT' + (" UNIQUE NOT NULL" if h == "ID" else "") for h in HEADERS)}
+);
+CREATE INDEX IF NOT EXISTS idx_visitors_email     ON visitors ("Email");
+CREATE INDEX IF NOT EXISTS idx_visitors_usertype  ON visitors ("UserType");
+CREATE INDEX IF NOT EXISTS idx_visitors_timestamp ON visitors ("Timestamp");
+
+CREATE TABLE IF NOT EXISTS visitor_counts (
+    bucket TEXT PRIMARY KEY,
+    n      INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS trg_visitors_count AFTER INSERT ON visitors
+BEGIN
+    INSERT INTO visitor_counts (bucket, n) VALUES ('total', 1)
+        ON CONFLICT (bucket) DO UPDATE SET n = n + 1;
+    INSERT INTO visitor_counts (bucket, n) VALUES ('type:' || coalesce(NEW."UserType", ''), 1)
+        ON CONFLICT (bucket) DO UPDATE SET n = n + 1;
+    INSERT INTO visitor_counts (bucket, n) VALUES ('day:' || substr(coalesce(NEW."Timestamp", ''), 1, 10), 1)
+        ON CONFLICT (bucket) DO UPDATE SET n = n + 1;
+END;
+"""
+
+# Backfill for databases created before visitor_counts existed. Run under
+# BEGIN IMMEDIATE, so only one process seeds; OR IGNORE in case one already did.
+_SEED_COUNTS = """
+INSERT OR IGNORE INTO visitor_counts (bucket, n)
+    SELECT 'total', COUNT(*) FROM visitors
+    UNION ALL
+    SELECT 'type:' || coalesce("UserType", ''), COUNT(*) FROM visitors GROUP BY 1
+    UNION ALL
+    SELECT 'day:' || substr(coalesce("Timestamp", ''), 1, 10), COUNT(*) FROM visitors GROUP BY 1
+"""
+
+
+class SQLiteVisitorStore:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conns  = ThreadConnections(db_path)
+        self._listeners: list = []
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+        with self._conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")   # check + seed hold the write lock — no trigger runs in between
+            if conn.execute("SELECT 1 FROM visitor_counts LIMIT 1").fetchone() is None:
+                conn.execute(_SEED_COUNTS)
+        logger.info(f"SQLite visitor store ready at {db_path}")
+
+    # ── Internal helpers ────────────────────────────────────────────────
+    def _conn(self) -> sqlite3.Connection:
+        return self._conns.get()
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> dict:
+        return {h: row[h] for h in HEADERS}
+
+    @staticmethod
+    def _to_params(row: list) -> list:
+        values = list(row[: len(HEADERS)])
+        values += [None] * (len(HEADERS) - len(values))
+        return [None if v is None else str(v) for v in values]
+
+    def _notify(self, records: list[dict], op: str):
+        for listener, ops in self._listeners:
+            if op not in ops:
+                continue
+            try:
+                listener(records)
+            except Exception as e:
+                logger.warning(f"SQLite listener failed: {e}")
+
+    # ── Public API ──────────────────────────────────────────────────────
+    def add_listener(self, listener, ops: tuple[str, ...] = ("append", "update")):
+        """Call listener(records) after every committed append and/or contact update."""
+        self._listeners.append((listener, ops))
+
+    def append_visitor(self, row: list):
+        self.append_visitors([row])
+
+    def append_visitors(self, rows: list[list]):
+        """One transaction per batch. Duplicate IDs are ignored, so retries are safe."""
+        if not rows:
+            return
+        try:
+            with self._conn() as conn:
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO visitors ({_COLUMNS}) "
+                    f"VALUES ({', '.join('?' for _ in HEADERS)})",
+                    [self._to_params(r) for r in rows],
+                )
+            logger.info(f"SQLite: {len(rows)} row(s) written.")
+        except Exception as e:
+            logger.error(f"SQLite append failed: {e}")
+            return
+        self._notify([{h: v for h, v in zip(HEADERS, self._to_params(r))} for r in rows], "append")
+
+    def get_all_visitors(self, since: str | None = None, until: str | None = None) -> list[dict]:
+        """
+        Return rows as list of dicts, oldest first (same order as the sheet).
+        since/until (inclusive, YYYY-MM-DD) become a range scan on the Timestamp index.
+        """
+        return list(self.iter_visitors(since, until))
+
+    def iter_visitors(
+        self,
+        since: str | None = None,
+        until: str | None = None,
+        newest_first: bool = False,
+    ):
+        """Lazily yield records straight off the cursor, in chunks."""
+        where, params = [], []
+        if since:
+            where.append('"Timestamp" >= ?')
+            params.append(since)
+        if until:
+            where.append('"Timestamp" < ?')
+            params.append(until + "\uffff")
+        sql = f"SELECT {_COLUMNS} FROM visitors"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY seq" + (" DESC" if newest_first else "")
+        try:
+            cur = self._conn().execute(sql, params)
+            while chunk := cur.fetchmany(500):
+                for row in chunk:
+                    yield self._to_record(row)
+        except Exception as e:
+            logger.error(f"SQLite read failed: {e}")
+
+    def get_visitor(self, visitor_id: str) -> dict | None:
+        """Single-row lookup on the ID unique index."""
+        try:
+            row = self._conn().execute(
+                f'SELECT {_COLUMNS} FROM visitors WHERE "ID" = ?', (visitor_id,)
+            ).fetchone()
+        except Exception as e:
+            logger.error(f"SQLite read failed: {e}")
+            return None
+        return self._to_record(row) if row else None
+
+    def get_latest_email(self) -> tuple[str | None, str | None]:
+        """Return (email, name) of the most recent valid visitor."""
+        try:
+            row = self._conn().execute(
+                """
+                SELECT "Email", "Name" FROM visitors
+                WHERE "Email" LIKE '%@%' AND lower("Email") NOT LIKE 'string%'
+                ORDER BY seq DESC LIMIT 1
+                """
+            ).fetchone()
+        except Exception as e:
+            logger.error(f"SQLite read failed: {e}")
+            return None, None
+        if not row:
+            return None, None
+        return row["Email"], row["Name"] or ""
+
+    def update_contact(self, email: str, github: str, linkedin: str):
+        """Update GitHub/LinkedIn on the latest row for this email."""
+        sets   = ['"Timestamp" = ?']
+        params = [datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
+        if github:
+            sets.append('"GitHub" = ?')
+            params.append(f"https://github.com/{github}")
+        if linkedin:
+            sets.append('"LinkedIn" = ?')
+            params.append(f"https://linkedin.com/in/{linkedin}")
+        try:
+            with self._conn() as conn:
+                row = conn.execute(
+                    f"""
+                    UPDATE visitors SET {", ".join(sets)}
+                    WHERE seq = (
+                        SELECT seq FROM visitors WHERE "Email" = ? ORDER BY seq DESC LIMIT 1
+                    )
+                    RETURNING {_COLUMNS}
+                    """,
+                    [*params, email],
+                ).fetchone()
+            logger.info(f"SQLite: contact updated for {email}")
+        except Exception as e:
+            logger.error(f"SQLite update_contact failed: {e}")
+            return
+        if row:
+            self._notify([self._to_record(row)], "update")
+
+    def get_stats(self) -> dict:
+        """Quick stats for the admin dashboard — keyed reads from visitor_counts."""
+        today   = datetime.now().strftime("%Y-%m-%d")
+        buckets = {
+            "total":     "total",
+            "hr":        "type:hr",
+            "developer": "type:developer",
+            "visitor":   "type:visitor",
+            "skipped":   "type:skipped",
+            "today":     f"day:{today}",
+        }
+        stats = dict.fromkeys(buckets, 0)
+        try:
+            rows = self._conn().execute(
+                f"SELECT bucket, n FROM visitor_counts "
+                f"WHERE bucket IN ({', '.join('?' for _ in buckets)})",
+                list(buckets.values()),
+            ).fetchall()
+            counts = {r["bucket"]: r["n"] for r in rows}
+            for key, bucket in buckets.items():
+                stats[key] = counts.get(bucket, 0)
+        except Exception as e:
+            logger.error(f"SQLite stats failed: {e}")
+        return stats
+
+    def is_empty(self) -> bool:
+        try:
+            return self._conn().execute("SELECT 1 FROM visitors LIMIT 1").fetchone() is None
+        except Exception:
+            return True
+
+    def import_records(self, records: list[dict]):
+        """Bulk-load records from another store (e.g. the legacy .xlsx)."""
+        self.append_visitors([[r.get(h) for h in HEADERS] for r in records])
+
+    def close(self):
+        """Close every thread's connection — called at shutdown."""
+        closed = self._conns.close()
+        if closed:
+            logger.info(f"SQLite: closed {closed} connection(s).")
@@ -0,0 +1,206 @@
+"""
+visitor_analytics.py
+Time-bucketed visitor analytics for /admin/analytics, computed with NumPy.
+
+Columnar snapshot:
+  Timestamp is held as int64 epoch seconds, and UserType / Source / Status
+  as int64 codes into per-field vocabularies — one growable array per
+  column, one row per visitor ID. add() upserts by ID, so the snapshot is
+  fed incrementally (store writes + admin cache merges, like the search
+  index) and is never rebuilt; histograms don't care about row order.
+
+Query:
+  Every histogram is a single np.bincount over (bucket × code), so a
+  query is a handful of vectorised passes regardless of row count.
+    day  → calendar days (YYYY-MM-DD), dense over the requested window
+    week → ISO weeks, labelled by their Monday
+    hour → hour of day (0-23), across the same window
+
+  The window is since → until when given; otherwise it runs from the
+  first visit to today, never more than _MAX_DAYS wide. A stray
+  timestamp (a future clock, a 1970 default) is counted in
+  `out_of_range` instead of stretching the axis to thousands of
+  empty buckets.
+
+Timestamps are the naive local times the log stores; rows whose Timestamp
+does not parse are counted in the totals but not in any histogram.
+Falls back gracefully if numpy is unavailable (NUMPY_OK).
+"""
+
+import logging
+import re
+from datetime import datetime
+from threading import Lock
+
+try:
+    import numpy as np
+    NUMPY_OK = True
+except ImportError:
+    NUMPY_OK = False
+
+logger = logging.getLogger("portfolio.analytics")
+
+CATEGORIES = ("UserType", "Source", "Status")
+
+_DAY   = 86_400
+_HOUR  = 3_600
+_MAX_DAYS = 3_660                        # widest day axis served (~10 years)
+_TS_RE = re.compile(r"^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2})?)?$")
+
+
+def _parse_timestamps(raw: list[str]) -> "np.ndarray":
+    """Vectorised parse to int64 epoch seconds; unparseable → NaT (int64 min)."""
+    try:
+        return np.array(raw, dtype="datetime64[s]").astype(np.int64)
+    except ValueError:
+        pass
+    # At least one bad cell — blank the malformed ones and retry in one go
+    cleaned = [v if _TS_RE.match(v) else "" for v in raw]
+    try:
+        return np.array(cleaned, dtype="datetime64[s]").astype(np.int64)
+    except ValueError:
+        parsed = np.empty(len(cleaned), dtype="datetime64[s]")
+        for i, value in enumerate(cleaned):
+            try:
+                parsed[i] = np.datetime64(value or "NaT", "s")
+            except ValueError:
+                parsed[i] = np.datetime64("NaT")
+        return parsed.astype(np.int64)
+
+
+class VisitorAnalytics:
+    def __init__(self, capacity: int = 1024):
+        self._n      = 0
+        self._ts     = np.empty(capacity, dtype=np.int64) if NUMPY_OK else None
+        self._codes  = {f: np.empty(capacity, dtype=np.int64) for f in CATEGORIES} if NUMPY_OK else {}
+        self._vocab: dict[str, list[str]]      = {f: [] for f in CATEGORIES}
+        self._code_of: dict[str, dict[str, int]] = {f: {} for f in CATEGORIES}
+        self._row_of: dict[str, int]           = {}
+        self._lock   = Lock()
+
+    # ── Internal helpers ────────────────────────────────────────────────
+    def _grow(self, needed: int):
+        """Double capacity until `needed` rows fit. Caller holds self._lock."""
+        capacity = len(self._ts)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self._ts = np.resize(self._ts, capacity)
+        for field in CATEGORIES:
+            self._codes[field] = np.resize(self._codes[field], capacity)
+
+    def _encode(self, field: str, values: list[str]) -> "np.ndarray":
+        """Codes for a batch — only the batch's distinct values touch the vocabulary."""
+        distinct, inverse = np.unique(np.array(values, dtype=str), return_inverse=True)
+        code_of, vocab = self._code_of[field], self._vocab[field]
+        mapping = np.empty(len(distinct), dtype=np.int64)
+        for i, value in enumerate(distinct.tolist()):
+            if value not in code_of:
+                code_of[value] = len(vocab)
+                vocab.append(value)
+            mapping[i] = code_of[value]
+        return mapping[inverse.reshape(-1)]
+
+    def _histogram(self, bucket: "np.ndarray", n_buckets: int, mask: "np.ndarray") -> dict:
+        """Totals plus a per-category breakdown for one bucketing of the rows in mask."""
+        result = {"total": np.bincount(bucket, minlength=n_buckets).tolist(), "by": {}}
+        for field in CATEGORIES:
+            k      = len(self._vocab[field]) or 1
+            codes  = self._codes[field][: self._n][mask]
+            counts = np.bincount(bucket * k + codes, minlength=n_buckets * k).reshape(n_buckets, k)
+            result["by"][field] = {
+                self._vocab[field][j]: counts[:, j].tolist()
+                for j in np.flatnonzero(counts.sum(axis=0))
+            }
+        return result
+
+    # ── Public API ──────────────────────────────────────────────────────
+    def add(self, records: list[dict]):
+        """Upsert records by ID — new IDs append a row, known IDs are overwritten."""
+        if not NUMPY_OK or not records:
+            return
+        latest = {str(r.get("ID") or ""): r for r in records}
+        latest.pop("", None)
+        if not latest:
+            return
+        batch = list(latest.values())
+        with self._lock:
+            rows = []
+            for record_id in latest:
+                row = self._row_of.get(record_id)
+                if row is None:
+                    row = self._row_of[record_id] = self._n
+                    self._n += 1
+                rows.append(row)
+            self._grow(self._n)
+            idx = np.array(rows, dtype=np.int64)
+            self._ts[idx] = _parse_timestamps([str(r.get("Timestamp") or "")[:19] for r in batch])
+            for field in CATEGORIES:
+                self._codes[field][idx] = self._encode(field, [str(r.get(field) or "") for r in batch])
+
+    def compute(self, since: str = "", until: str = "") -> dict:
+        """since/until are inclusive YYYY-MM-DD[ HH:MM:SS] bounds on Timestamp."""
+        with self._lock:
+            n     = self._n
+            ts    = self._ts[:n]
+            valid = ts != np.iinfo(np.int64).min
+            mask  = np.ones(n, dtype=bool)
+            if since:
+                mask &= valid & (ts >= np.datetime64(since, "s").astype(np.int64))
+            if until:
+                step  = np.timedelta64(1, "D") if len(until) <= 10 else np.timedelta64(1, "s")
+                mask &= valid & (ts < (np.datetime64(until, "s") + step).astype(np.int64))
+
+            total    = int(mask.sum())
+            types    = self._vocab["UserType"]
+            by_type  = np.bincount(self._codes["UserType"][:n][mask], minlength=len(types))
+            type_n   = {t: int(by_type[i]) for i, t in enumerate(types) if by_type[i]}
+            skipped  = type_n.get("skipped", 0)
+            answered = total - skipped
+
+            dated = mask & valid
+            days  = np.where(dated, ts // _DAY, 0)
+            last_day  = (int(np.datetime64(until[:10], "D").astype(np.int64)) if until
+                         else int(np.datetime64(datetime.now().strftime("%Y-%m-%d"), "D").astype(np.int64)))
+            floor_day = last_day - _MAX_DAYS + 1
+            if since:
+                first_day = max(int(np.datetime64(since[:10], "D").astype(np.int64)), floor_day)
+            else:
+                recent    = days[dated & (days >= floor_day) & (days <= last_day)]
+                first_day = int(recent.min()) if recent.size else last_day
+            binned    = dated & (days >= first_day) & (days <= last_day)
+            stamp     = ts[binned]
+            response = {
+                "total":         total,
+                "undated":       int(total - dated.sum()),
+                "out_of_range":  int(dated.sum() - binned.sum()),
+                "skip_rate":     round(skipped / total, 4) if total else 0.0,
+                "hr_conversion": round(type_n.get("hr", 0) / answered, 4) if answered else 0.0,
+                "by_type":       type_n,
+            }
+            if not stamp.size:
+                empty = {"buckets": [], "total": [], "by": {f: {} for f in CATEGORIES}}
+                return {**response, "day": empty, "week": empty,
+                        "hour": {**empty, "buckets": list(range(24)), "total": [0] * 24}}
+
+            days  = stamp // _DAY
+            weeks = (days + 3) // 7              # 1970-01-01 was a Thursday → weeks start Monday
+            hours = (stamp % _DAY) // _HOUR
+            first_week = (first_day + 3) // 7
+            n_days     = last_day - first_day + 1
+            n_weeks    = (last_day + 3) // 7 - first_week + 1
+
+            day_labels  = np.arange(first_day, first_day + n_days).astype("datetime64[D]")
+            week_labels = (np.arange(first_week, first_week + n_weeks) * 7 - 3).astype("datetime64[D]")
+
+            response["day"]  = {"buckets": [str(d) for d in day_labels],
+                                **self._histogram(days - first_day, n_days, binned)}
+            response["week"] = {"buckets": [str(w) for w in week_labels],
+                                **self._histogram(weeks - first_week, n_weeks, binned)}
+            response["hour"] = {"buckets": list(range(24)),
+                                **self._histogram(hours, 24, binned)}
+            return response
+
+    def __len__(self) -> int:
+        return self._n
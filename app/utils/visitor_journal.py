@@ -0,0 +1,142 @@
+"""
+visitor_journal.py
+Append-only, line-delimited journal — the primary write path for the visitor log.
+
+One JSON object per line:
+    {"op": "append", "row": [...]}                              → new visitor row
+    {"op": "update", "email": ..., "github": ..., "linkedin": ...,
+     "timestamp": ...}                                         → contact update
+    {"op": "remove", "id": ...}                                → row moved to another month
+
+Every write is flushed to the OS straight away, but fsync is batched:
+the file is synced every `fsync_every` records or `fsync_interval` seconds,
+whichever comes first. An append therefore costs the same no matter how
+much history the .xlsx holds — ExcelManager folds the journal into the
+workbook during compaction.
+
+Also backs the Sheets outbox (app/services/sheets_writer.py), which uses
+read_entries() to acknowledge records one batch at a time.
+"""
+
+import json
+import logging
+import os
+import time
+from threading import Lock
+
+logger = logging.getLogger("portfolio.journal")
+
+
+class VisitorJournal:
+    def __init__(self, path: str, fsync_every: int = 20, fsync_interval: float = 1.0):
+        self.path           = path
+        self.fsync_every    = fsync_every
+        self.fsync_interval = fsync_interval
+        self._fh            = None
+        self._unsynced      = 0
+        self._last_sync     = time.monotonic()
+        self._lock          = Lock()
+
+    # ── Internal helpers ────────────────────────────────────────────────
+    def _open(self):
+        if self._fh is None or self._fh.closed:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._fh = open(self.path, "a", encoding="utf-8")
+        return self._fh
+
+    def _fsync(self):
+        if self._fh is not None and not self._fh.closed:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+        self._unsynced  = 0
+        self._last_sync = time.monotonic()
+
+    # ── Public API ──────────────────────────────────────────────────────
+    def append(self, records: list[dict]):
+        """Write records as one contiguous block; fsync when the batch is due."""
+        if not records:
+            return
+        block = "".join(
+            json.dumps(r, default=str, ensure_ascii=False) + "\n" for r in records
+        )
+        with self._lock:
+            fh = self._open()
+            fh.write(block)
+            fh.flush()
+            self._unsynced += len(records)
+            if (
+                self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._fsync()
+
+    def read(self) -> list[dict]:
+        """Return every complete record in the journal."""
+        return self.read_from(0)[0]
+
+    def _scan(self, offset: int):
+        """Yield (record or None, end_offset) per complete line from byte `offset`."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break   # torn final line — left for the next read
+                offset += len(line)
+                line = line.strip()
+                if not line:
+                    yield None, offset
+                    continue
+                try:
+                    yield json.loads(line), offset
+                except json.JSONDecodeError:
+                    logger.warning(f"Journal {self.path}: skipping corrupt record")
+                    yield None, offset
+
+    def read_from(self, offset: int) -> tuple[list[dict], int]:
+        """
+        Return (records, end_offset) for complete records starting at byte `offset`.
+        A torn final line (crash or concurrent mid-write) is left for the next read.
+        """
+        records = []
+        for record, offset in self._scan(offset):
+            if record is not None:
+                records.append(record)
+        return records, offset
+
+    def read_entries(self, offset: int, limit: int | None = None) -> list[tuple[dict, int]]:
+        """(record, offset just past it) pairs from byte `offset` — at most `limit` records."""
+        entries = []
+        for record, end in self._scan(offset):
+            if record is not None:
+                if limit is not None and len(entries) >= limit:
+                    break
+                entries.append((record, end))
+        return entries
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def sync(self):
+        """Force any unsynced records to disk."""
+        with self._lock:
+            if self._unsynced:
+                self._fsync()
+
+    def truncate(self):
+        """Drop all records — called once they have been compacted into the .xlsx."""
+        with self._lock:
+            fh = self._open()
+            fh.truncate(0)
+            self._fsync()
+
+    def close(self):
+        with self._lock:
+            if self._fh is not None and not self._fh.closed:
+                self._fsync()
+                self._fh.close()
+            self._fh = None
@@ -0,0 +1,116 @@
+"""
+visitor_stats.py
+Incrementally maintained visitor counters, persisted next to the Excel log.
+
+State file (visitors.stats.json):
+    {"total": 1234, "by_type": {"hr": 40, ...}, "day": "2026-10-17", "today": 12}
+
+Counters are bumped as rows are appended, so reading them is O(1) no
+matter how many visitors are logged. "today" rolls over to 0 the first
+time it is read or written on a new day.
+
+"today" counts rows appended today. A contact update restamps the row's
+Timestamp, but does not move it into "today" (the old full-scan
+/admin/stats did count restamped rows) — the same holds on the SQLite
+backend, whose day buckets are bumped by the insert trigger only.
+
+Nothing recounts after seeding. The bump runs after the journal fsync,
+so a crash between the two leaves the counters short by that batch.
+To recover, delete visitors.stats.json: the next start reseeds it from
+the log (ExcelManager._ensure_stats).
+
+Not thread- or process-safe on its own — ExcelManager calls it while
+holding its lock and the exclusive file lock.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+
+logger = logging.getLogger("portfolio.stats")
+
+USER_TYPES = ("hr", "developer", "visitor", "skipped")
+
+
+class VisitorStats:
+    def __init__(self, path: str):
+        self.path   = path
+        self._state = None
+        self._sig   = None
+
+    # ── Internal helpers ────────────────────────────────────────────────
+    @staticmethod
+    def _today() -> str:
+        return datetime.now().strftime("%Y-%m-%d")
+
+    @staticmethod
+    def _empty() -> dict:
+        return {"total": 0, "by_type": {}, "day": VisitorStats._today(), "today": 0}
+
+    def _file_sig(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _load(self) -> dict:
+        """Cached read — only re-reads the file when another process changed it."""
+        sig = self._file_sig()
+        if self._state is None or sig != self._sig:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._state = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._state = self._empty()
+            self._sig = sig
+        return self._state
+
+    def _save(self, state: dict):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+        self._state = state
+        self._sig   = self._file_sig()
+
+    @classmethod
+    def _count(cls, state: dict, records: list[dict]):
+        for r in records:
+            user_type = r.get("UserType") or ""
+            state["total"] += 1
+            state["by_type"][user_type] = state["by_type"].get(user_type, 0) + 1
+            if str(r.get("Timestamp") or "").startswith(state["day"]):
+                state["today"] += 1
+
+    # ── Public API ──────────────────────────────────────────────────────
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def record(self, records: list[dict]):
+        """Count freshly appended records and persist."""
+        if not records:
+            return
+        state = dict(self._load())
+        state["by_type"] = dict(state.get("by_type", {}))
+        if state.get("day") != self._today():
+            state["day"], state["today"] = self._today(), 0
+        self._count(state, records)
+        self._save(state)
+
+    def rebuild(self, records: list[dict]):
+        """Recount from scratch — used to seed a missing stats file."""
+        state = self._empty()
+        self._count(state, records)
+        self._save(state)
+        logger.info(f"Visitor stats rebuilt from {len(records)} record(s).")
+
+    def snapshot(self) -> dict:
+        state = self._load()
+        today = state.get("today", 0) if state.get("day") == self._today() else 0
+        stats = {"total": state.get("total", 0)}
+        for user_type in USER_TYPES:
+            stats[user_type] = state.get("by_type", {}).get(user_type, 0)
+        stats["today"] = today
+        return stats
@@ -0,0 +1,41 @@
+"""
+visitor_store.py
+Picks the visitor log backend from settings.
+
+VISITOR_STORE=excel   → ExcelManager        (journal + styled .xlsx, default)
+VISITOR_STORE=sqlite  → SQLiteVisitorStore  (WAL database, indexed queries)
+
+Both expose the same methods, so routers only ever call get_visitor_store().
+
+One instance per process: every router shares it, so there is a single
+in-process lock, snapshot and writer. Cross-process safety comes from the
+backends themselves — an flock around the Excel journal/compaction, and
+SQLite's own WAL locking.
+"""
+
+import logging
+from functools import lru_cache
+
+from app.settings.config import VisitorStoreBackend, get_settings
+from app.utils.excel_manager import ExcelManager, log_exists
+from app.utils.sqlite_store import SQLiteVisitorStore
+
+logger   = logging.getLogger("portfolio.store")
+settings = get_settings()
+
+
+@lru_cache
+def get_visitor_store():
+    storage = settings.storage
+
+    if storage.visitor_store == VisitorStoreBackend.SQLITE:
+        store = SQLiteVisitorStore(storage.visitor_db_path)
+        # First run on SQLite — carry over history from the Excel log, read as-is
+        if store.is_empty() and log_exists(storage.visitor_log_path):
+            records = ExcelManager.read_log(storage.visitor_log_path)
+            if records:
+                store.import_records(records)
+                logger.info(f"Imported {len(records)} visitor(s) from {storage.visitor_log_path}")
+        return store
+
+    return ExcelManager(storage.visitor_log_path)
@@ -0,0 +1,106 @@
+"""
+visitor_writer.py
+Group-commit writer for visitor rows.
+
+Request handlers call submit(row), which only puts the row on a queue.
+A single daemon thread drains the queue and hands rows to the visitor
+log in batches — a batch closes at `max_batch` rows or `max_wait`
+seconds after its first row, whichever comes first. One batch costs one
+journal write + one fsync, however many requests contributed to it, and
+visitor writes never occupy the shared threadpool.
+
+Usage:
+    writer = VisitorWriter(excel)
+    writer.start()          # lifespan startup
+    writer.submit(row)      # request path — never blocks
+    writer.stop()           # lifespan shutdown — drains what is queued
+"""
+
+import logging
+import queue
+import time
+from threading import Lock, Thread
+
+logger = logging.getLogger("portfolio.writer")
+
+_STOP = object()
+
+
+class VisitorWriter:
+    def __init__(self, store, max_batch: int = 200, max_wait: float = 0.5):
+        self.store     = store
+        self.max_batch = max_batch
+        self.max_wait  = max_wait
+        self._queue    = queue.Queue()
+        self._thread   = None
+        self._lock     = Lock()
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = Thread(target=self._run, name="visitor-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Flush everything queued so far, then stop the writer thread."""
+        with self._lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return
+            self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Visitor writer did not drain before shutdown timeout.")
+
+    # ── Public API ──────────────────────────────────────────────────────
+    def submit(self, row: list):
+        """Queue a row for the next batch. Starts the writer on first use."""
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        self._queue.put(row)
+
+    # ── Writer thread ───────────────────────────────────────────────────
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch    = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._flush(batch)
+
+        # Anything submitted after the stop marker still gets written
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftovers.append(item)
+        if leftovers:
+            self._flush(leftovers)
+
+    def _flush(self, batch: list[list]):
+        try:
+            self.store.append_visitors(batch)
+            logger.info(f"Visitor writer: committed batch of {len(batch)} row(s).")
+        except Exception as e:
+            logger.error(f"Visitor writer: batch of {len(batch)} row(s) failed: {e}")
@@ -0,0 +1,125 @@
+"""
+test_excel_manager.py
+Monthly partitions: compaction of journalled ops, the legacy split
+migration and moving a restamped row across months.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from app.utils.excel_manager import HEADERS, ExcelManager   # noqa: E402
+
+
+def _row(visitor_id: str, email: str, timestamp: str) -> list:
+    values = {"ID": visitor_id, "Name": visitor_id.upper(), "Email": email,
+              "UserType": "hr", "Timestamp": timestamp}
+    return [values.get(h) for h in HEADERS]
+
+
+def _sheet_rows(path: str) -> list[dict]:
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        rows = list(wb.active.iter_rows(values_only=True))
+    finally:
+        wb.close()
+    header = rows[0]
+    return [dict(zip(header, row)) for row in rows[1:]]
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "visitors.xlsx")
+
+
+def test_compaction_applies_append_update_and_remove(log_path):
+    manager = ExcelManager(log_path)
+    manager.append_visitors([
+        _row("a", "a@example.com", "2026-01-05 10:00:00"),
+        _row("b", "b@example.com", "2026-01-06 10:00:00"),
+        _row("c", "c@example.com", "2026-01-07 10:00:00"),
+    ])
+    p = manager._partition("2026-01")
+    with manager._lock, manager._file_lock.exclusive():
+        manager._journal_ops(p, [
+            {"op": "update", "email": "b@example.com", "github": "bee",
+             "linkedin": "", "timestamp": "2026-01-20 09:00:00"},
+            {"op": "remove", "id": "a"},
+        ])
+    manager.compact("2026-01")
+
+    assert os.path.getsize(p.journal.path) == 0
+    rows = _sheet_rows(p.filepath)
+    assert [r["ID"] for r in rows] == ["b", "c"]
+    assert rows[0]["GitHub"] == "https://github.com/bee"
+    assert rows[0]["Timestamp"] == "2026-01-20 09:00:00"
+
+    # A fresh process reads the same thing from the workbook alone
+    fresh = ExcelManager(log_path)
+    assert [r["ID"] for r in fresh.get_all_visitors()] == ["b", "c"]
+    manager.close()
+
+
+def test_journal_replay_ignores_a_torn_line(log_path):
+    manager = ExcelManager(log_path)
+    manager.append_visitor(_row("a", "a@example.com", "2026-02-01 10:00:00"))
+    journal = manager._partition("2026-02").journal.path
+    manager._partition("2026-02").journal.close()
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"op": "append", "row": ["torn"')
+
+    fresh = ExcelManager(log_path)
+    assert [r["ID"] for r in fresh.get_all_visitors()] == ["a"]
+
+
+def test_legacy_log_is_split_into_monthly_partitions(tmp_path, log_path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(HEADERS)
+    ws.append(_row("a", "a@example.com", "2025-11-03 10:00:00"))
+    ws.append(_row("b", "b@example.com", "2025-12-04 10:00:00"))
+    wb.save(log_path)
+    with open(str(tmp_path / "visitors.journal"), "w", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "append", "row": _row("c", "c@example.com", "2025-12-09 10:00:00")}) + "\n")
+
+    manager = ExcelManager(log_path)
+
+    assert not os.path.exists(log_path)
+    assert os.path.exists(log_path + ".migrated")
+    assert not os.path.exists(str(tmp_path / "visitors.journal"))
+    assert [r["ID"] for r in _sheet_rows(str(tmp_path / "visitors-2025-11.xlsx"))] == ["a"]
+    assert [r["ID"] for r in _sheet_rows(str(tmp_path / "visitors-2025-12.xlsx"))] == ["b", "c"]
+    assert manager.get_stats()["total"] == 3
+
+    # Re-running on the already split log is a no-op
+    again = ExcelManager(log_path)
+    assert [r["ID"] for r in again.get_all_visitors()] == ["a", "b", "c"]
+
+
+def test_contact_update_moves_a_restamped_row_to_the_current_month(log_path):
+    manager = ExcelManager(log_path)
+    manager.append_visitors([
+        _row("old", "old@example.com", "2025-06-01 10:00:00"),
+        _row("keep", "keep@example.com", "2025-06-02 10:00:00"),
+    ])
+    updates = []
+    manager.add_listener(updates.extend, ops=("update",))
+
+    manager.update_contact("old@example.com", "octo", "")
+
+    month = datetime.now().strftime("%Y-%m")
+    moved = manager.get_visitor("old")
+    assert moved["Timestamp"].startswith(month)
+    assert moved["GitHub"] == "https://github.com/octo"
+    assert [r["ID"] for r in updates] == ["old"]
+    assert [r["ID"] for r in manager.get_all_visitors(until="2025-06-30")] == ["keep"]
+
+    manager.close()
+    fresh = ExcelManager(log_path)
+    assert [r["ID"] for r in fresh.get_all_visitors()] == ["keep", "old"]
+    assert [r["ID"] for r in _sheet_rows(fresh._partition("2025-06").filepath)] == ["keep"]
+    assert [r["ID"] for r in _sheet_rows(fresh._partition(month).filepath)] == ["old"]
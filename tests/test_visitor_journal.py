@@ -0,0 +1,46 @@
+"""
+test_visitor_journal.py
+Replay of the append-only journal, including a torn final line.
+"""
+
+from app.utils.visitor_journal import VisitorJournal
+
+
+def test_torn_final_line_is_left_for_the_next_read(tmp_path):
+    journal = VisitorJournal(str(tmp_path / "visitors.journal"))
+    journal.append([{"op": "append", "row": ["a"]}, {"op": "append", "row": ["b"]}])
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"op": "append", "row": ["c"')          # crash mid-write
+
+    records, offset = journal.read_from(0)
+    assert [r["row"] for r in records] == [["a"], ["b"]]
+
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write("]}\n")                                 # the writer finishes the line
+    records, _ = journal.read_from(offset)
+    assert [r["row"] for r in records] == [["c"]]
+
+
+def test_corrupt_line_is_skipped(tmp_path):
+    journal = VisitorJournal(str(tmp_path / "visitors.journal"))
+    journal.append([{"op": "append", "row": ["a"]}])
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write("not json\n")
+    journal.append([{"op": "append", "row": ["b"]}])
+    journal.close()
+
+    assert [r["row"] for r in journal.read()] == [["a"], ["b"]]
+
+
+def test_read_entries_offsets_resume_after_each_record(tmp_path):
+    journal = VisitorJournal(str(tmp_path / "outbox.journal"))
+    journal.append([{"n": 1}, {"n": 2}, {"n": 3}])
+    journal.close()
+
+    first = journal.read_entries(0, limit=2)
+    assert [r["n"] for r, _ in first] == [1, 2]
+    rest = journal.read_entries(first[-1][1])
+    assert [r["n"] for r, _ in rest] == [3]
+    assert rest[-1][1] == journal.size()